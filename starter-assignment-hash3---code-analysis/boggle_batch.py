@@ -0,0 +1,155 @@
+"""
+Batch solving of many Boggle boards against one dictionary.
+
+Creating a Boggle object per board rebuilds the dictionary every time.
+BoggleBatchSolver builds the dictionary engine once and hands it to a pool
+of worker processes through the pool initializer: each worker receives it a
+single time and then reuses one Boggle object for every board it solves.
+An engine loaded from an on-disk index (boggle_index.py) is not copied at
+all; each worker maps the same index file, so they share its pages.
+
+Boards are sent in chunks, and results are yielded as soon as each chunk
+finishes, so the caller can consume them while the rest are still solving.
+"""
+
+import os
+from concurrent.futures import (FIRST_COMPLETED, ProcessPoolExecutor,
+                                as_completed, wait)
+
+from boggle_dictionary import DEFAULT_ENGINE, build_dictionary
+from boggle_index import open_index
+from boggle_solver import Boggle
+
+# Number of boards sent to a worker in one task
+DEFAULT_CHUNK_SIZE = 16
+# Chunks kept in flight per worker, to bound memory on huge batches
+CHUNKS_PER_WORKER = 4
+
+# Per-process solver, set up by _init_worker
+_worker_game = None
+
+
+def shareable_engine(engine):
+    """
+    Returns the (engine, index_path) pair to send to worker processes: the
+    index path for engines mapped from disk, the engine itself otherwise.
+    """
+    index_path = getattr(engine, "index_path", None)
+    if index_path is not None:
+        return None, index_path
+    return engine, None
+
+
+def restore_engine(engine, index_path):
+    """
+    Inverse of shareable_engine, run in the worker process.
+    """
+    if index_path is not None:
+        return open_index(index_path)
+    return engine
+
+
+def _init_worker(engine, index_path, options):
+    """
+    Pool initializer: builds the Boggle object this worker reuses.
+    """
+    global _worker_game
+    _worker_game = Boggle([], restore_engine(engine, index_path), **options)
+
+
+def _solve_chunk(chunk):
+    """
+    Solves a list of (grid_id, grid) pairs in a worker process.
+    """
+    results = []
+    for grid_id, grid in chunk:
+        _worker_game.setGrid(grid)
+        results.append((grid_id, _worker_game.getSolution()))
+    return results
+
+
+def _numbered(grids):
+    """
+    Yields (grid_id, grid) pairs. Mappings keep their keys; other iterables
+    are numbered from 0.
+    """
+    if hasattr(grids, "items"):
+        return iter(grids.items())
+    return enumerate(grids)
+
+
+def _chunked(pairs, size):
+    chunk = []
+    for pair in pairs:
+        chunk.append(pair)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+class BoggleBatchSolver:
+    """
+    Solves many boards against one shared dictionary.
+    """
+
+    def __init__(self, dictionary, workers=None,
+                 min_len=Boggle.DEFAULT_MIN_LEN, allow_diagonals=True,
+                 engine=DEFAULT_ENGINE, core="iterative",
+                 chunk_size=DEFAULT_CHUNK_SIZE):
+        """
+        :param dictionary: Raw words or a prebuilt dictionary engine. It is
+            built once, here.
+        :param workers: Number of worker processes. Defaults to the CPU
+            count. With 1, boards are solved in this process.
+        :param min_len: The minimum required length for a word.
+        :param allow_diagonals: If True, diagonal moves are allowed.
+        :param engine: Dictionary engine name, used if ``dictionary`` is a
+            word list.
+        :param core: Search core used by the workers (see Boggle.CORES).
+        :param chunk_size: Boards per task sent to a worker.
+        """
+        self.dictionary = build_dictionary(dictionary, engine)
+        self.workers = workers or os.cpu_count() or 1
+        self.chunk_size = chunk_size
+        # The iterative core needs a walkable engine
+        if core == "iterative" and not self.dictionary.walkable:
+            core = "recursive"
+        self.options = {"min_len": min_len,
+                        "allow_diagonals": allow_diagonals,
+                        "core": core}
+
+    def solve_many(self, grids):
+        """
+        Solves every grid and yields (grid_id, sorted_words) pairs as they
+        finish. Results may arrive in any order.
+
+        :param grids: A mapping of grid_id to grid, or an iterable of grids
+            (whose ids are then their positions).
+        """
+        chunks = _chunked(_numbered(grids), self.chunk_size)
+
+        if self.workers == 1:
+            game = Boggle([], self.dictionary, **self.options)
+            for chunk in chunks:
+                for grid_id, grid in chunk:
+                    game.setGrid(grid)
+                    yield grid_id, game.getSolution()
+            return
+
+        engine, index_path = shareable_engine(self.dictionary)
+        with ProcessPoolExecutor(max_workers=self.workers,
+                                 initializer=_init_worker,
+                                 initargs=(engine, index_path,
+                                           self.options)) as pool:
+            pending = set()
+            limit = self.workers * CHUNKS_PER_WORKER
+            for chunk in chunks:
+                pending.add(pool.submit(_solve_chunk, chunk))
+                if len(pending) >= limit:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        yield from future.result()
+            for future in as_completed(pending):
+                yield from future.result()
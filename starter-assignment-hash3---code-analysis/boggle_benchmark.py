@@ -0,0 +1,359 @@
+"""
+Benchmarks for the Boggle solver.
+
+Two benchmarks live here:
+
+- compare_cores(): the recursive and iterative search cores of this
+  directory's solver on random boards from 4x4 up to 13x13, solved against
+  the ENABLE word list shipped with the React app. Both cores share one
+  prebuilt dictionary engine, so only the search itself is timed.
+- run_suite(): a scaling benchmark of every boggle_solver.Boggle in the
+  repository (this directory's solver in several configurations, plus the
+  original versions at the repository root and in Starter-Project-2).
+  Boards are rolled from Boggle dice with a fixed seed, dictionaries range
+  from 1k to 500k words, and for each board the suite records solve time,
+  peak memory and the number of DFS nodes visited. Results are written to a
+  JSON file so runs from different commits can be compared.
+
+Run it directly:
+
+    python3 boggle_benchmark.py --cores
+    python3 boggle_benchmark.py --output bench.json
+"""
+
+import argparse
+import gc
+import importlib.util
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+import tracemalloc
+
+from boggle_dice import dice_grid
+from boggle_dictionary import TrieDictionary
+from boggle_solver import Boggle
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+REPO_ROOT = os.path.dirname(HERE)
+WORDLIST_PATH = os.path.join(
+    REPO_ROOT, "starter-assignment#4-react-boggle", "boggle-app", "src",
+    "full-wordlist.json")
+
+# Rough English letter frequencies, so random boards contain words
+LETTER_WEIGHTS = {
+    "A": 8, "B": 2, "C": 3, "D": 4, "E": 12, "F": 2, "G": 2, "H": 5,
+    "I": 7, "J": 1, "K": 1, "L": 4, "M": 3, "N": 7, "O": 8, "P": 2,
+    "Qu": 1, "R": 6, "S": 6, "T": 9, "U": 3, "V": 1, "W": 2, "X": 1,
+    "Y": 2, "Z": 1,
+}
+
+DEFAULT_BOARD_SIZES = (4, 6, 8, 10, 13)
+DEFAULT_DICTIONARY_SIZES = (1000, 10000, 100000, 500000)
+
+
+def load_wordlist(path=WORDLIST_PATH):
+    """
+    Returns the word list stored in the React app's full-wordlist.json.
+    """
+    with open(path, encoding="utf-8") as source:
+        return json.load(source)["words"]
+
+
+def random_grid(size, rng):
+    """
+    Returns a random ``size`` x ``size`` board drawn from LETTER_WEIGHTS.
+    """
+    letters = list(LETTER_WEIGHTS)
+    weights = list(LETTER_WEIGHTS.values())
+    return [rng.choices(letters, weights, k=size) for _ in range(size)]
+
+
+def synthetic_dictionary(size, rng, base_words=None):
+    """
+    Returns ``size`` unique words. They are sampled from ``base_words``
+    (ENABLE by default); beyond its size, extra pseudo-words are generated
+    by a letter-bigram model trained on it, so they look like English.
+    """
+    base_words = base_words if base_words is not None else load_wordlist()
+    if size <= len(base_words):
+        return rng.sample(base_words, size)
+
+    transitions = {}
+    lengths = []
+    for word in base_words:
+        lengths.append(len(word))
+        for a, b in zip("^" + word, word + "$"):
+            transitions.setdefault(a, []).append(b)
+
+    words = set(base_words)
+    attempts = 0
+    while len(words) < size:
+        attempts += 1
+        if attempts > 100 * size:
+            raise ValueError("Base word list too small to generate %d "
+                             "unique words" % size)
+        target = rng.choice(lengths)
+        letters = []
+        letter = rng.choice(transitions["^"])
+        while letter != "$" and len(letters) < target:
+            letters.append(letter)
+            letter = rng.choice(transitions[letter])
+        if len(letters) >= 3:
+            words.add("".join(letters))
+    return sorted(words)
+
+
+def time_solve(grid, engine, repeat=3, **options):
+    """
+    Solves ``grid`` ``repeat`` times and returns the best time in seconds
+    together with the solution.
+    """
+    game = Boggle(grid, engine, **options)
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        solution = game.getSolution()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, solution
+
+
+def compare_cores(sizes=range(4, 14), engine=None, seed=0):
+    """
+    Times both search cores on one random board per size.
+
+    :return: A list of (size, words found, recursive seconds, iterative
+        seconds) rows.
+    """
+    engine = engine or TrieDictionary(load_wordlist())
+    rng = random.Random(seed)
+    rows = []
+    for size in sizes:
+        grid = random_grid(size, rng)
+        recursive, expected = time_solve(grid, engine, core="recursive")
+        iterative, solution = time_solve(grid, engine, core="iterative")
+        if solution != expected:
+            raise AssertionError("Cores disagree on a %dx%d board"
+                                 % (size, size))
+        rows.append((size, len(solution), recursive, iterative))
+    return rows
+
+
+# --------------------------------------------------------------------------
+# Scaling Suite
+# --------------------------------------------------------------------------
+def load_solver_module(path, name):
+    """
+    Imports a boggle_solver.py file under a unique module name, so the
+    repository's several versions can be loaded side by side.
+    """
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def implementations():
+    """
+    Returns (label, factory) pairs for every solver to benchmark. A
+    factory takes a word list and returns a Boggle object on an empty grid
+    with that dictionary built.
+    """
+    found = [
+        ("code-analysis trie/iterative",
+         lambda words: Boggle([], words, core="iterative")),
+        ("code-analysis trie/recursive",
+         lambda words: Boggle([], words, core="recursive")),
+        ("code-analysis set/recursive",
+         lambda words: Boggle([], words, engine="set")),
+    ]
+    legacy = [("root", os.path.join(REPO_ROOT, "boggle_solver.py")),
+              ("Starter-Project-2",
+               os.path.join(REPO_ROOT, "Starter-Project-2",
+                            "boggle_solver.py"))]
+    for label, path in legacy:
+        if os.path.exists(path):
+            module = load_solver_module(
+                path, "boggle_solver_" + label.replace("-", "_").lower())
+            found.append((label, lambda words, cls=module.Boggle:
+                          cls([], words)))
+    return found
+
+
+def count_nodes(game):
+    """
+    Solves ``game`` once more and returns the number of DFS steps, i.e.
+    cells tried. This directory's solver reports it through its search
+    statistics; the older versions have their recursive dfs wrapped with a
+    counter.
+    """
+    if isinstance(game, Boggle):
+        game.enable_stats()
+        try:
+            game.getSolution()
+        finally:
+            game.disable_stats()
+        return game.stats.nodes_visited
+    method = game.dfs
+    calls = [0]
+
+    def counted(*args):
+        calls[0] += 1
+        return method(*args)
+
+    game.dfs = counted
+    try:
+        game.getSolution()
+    finally:
+        del game.dfs
+    return calls[0]
+
+
+def measure_peak(function):
+    """
+    Runs ``function`` under tracemalloc and returns (result, peak bytes
+    allocated while it ran).
+    """
+    gc.collect()
+    tracemalloc.start()
+    try:
+        result = function()
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return result, peak
+
+
+def run_suite(board_sizes=DEFAULT_BOARD_SIZES,
+              dictionary_sizes=DEFAULT_DICTIONARY_SIZES, boards_per_size=1,
+              repeat=3, seed=0, solvers=None):
+    """
+    Runs every solver on seeded dice boards against synthetic dictionaries.
+
+    Each record holds the solver label, board and dictionary size, the
+    dictionary build time and peak memory, the best solve time of
+    ``repeat`` runs, the peak memory of one solve, the DFS nodes visited
+    and the number of words found. Time and memory are measured in
+    separate runs, as tracing memory slows the code down.
+
+    :return: The list of records.
+    """
+    solvers = solvers if solvers is not None else implementations()
+    base_words = load_wordlist()
+    records = []
+    for dictionary_size in dictionary_sizes:
+        words = synthetic_dictionary(dictionary_size,
+                                     random.Random(seed), base_words)
+        rng = random.Random(seed)
+        boards = [(size, dice_grid(size, rng))
+                  for size in board_sizes for _ in range(boards_per_size)]
+        for label, factory in solvers:
+            start = time.perf_counter()
+            factory(words)
+            build_seconds = time.perf_counter() - start
+            game, build_peak = measure_peak(lambda: factory(words))
+
+            for size, grid in boards:
+                game.setGrid(grid)
+                best = None
+                for _ in range(repeat):
+                    start = time.perf_counter()
+                    solution = game.getSolution()
+                    elapsed = time.perf_counter() - start
+                    best = elapsed if best is None else min(best, elapsed)
+                _, solve_peak = measure_peak(game.getSolution)
+                records.append({
+                    "solver": label,
+                    "board_size": size,
+                    "dictionary_size": dictionary_size,
+                    "build_seconds": build_seconds,
+                    "build_peak_bytes": build_peak,
+                    "solve_seconds": best,
+                    "solve_peak_bytes": solve_peak,
+                    "nodes_visited": count_nodes(game),
+                    "words_found": len(solution),
+                })
+            del game
+    return records
+
+
+def git_commit():
+    """
+    Returns the current git commit of the repository, or None.
+    """
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "HEAD"], cwd=HERE,
+            stderr=subprocess.DEVNULL).decode().strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def write_results(records, path, **settings):
+    """
+    Writes benchmark records and run metadata to a JSON file.
+    """
+    report = {
+        "meta": dict(settings, commit=git_commit(),
+                     python=platform.python_version(),
+                     platform=platform.platform(),
+                     timestamp=time.strftime("%Y-%m-%dT%H:%M:%S")),
+        "results": records,
+    }
+    with open(path, "w", encoding="utf-8") as out:
+        json.dump(report, out, indent=2)
+
+
+def print_records(records):
+    print("%-30s %5s %7s %10s %10s %10s %8s %6s" % (
+        "solver", "board", "words", "build", "solve", "peak", "nodes",
+        "found"))
+    for record in records:
+        print("%-30s %5s %7d %9.2fs %8.2fms %8.1fKB %8d %6d" % (
+            record["solver"], "%dx%d" % ((record["board_size"],) * 2),
+            record["dictionary_size"], record["build_seconds"],
+            record["solve_seconds"] * 1000,
+            record["solve_peak_bytes"] / 1024, record["nodes_visited"],
+            record["words_found"]))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--cores", action="store_true",
+                        help="only compare the two search cores")
+    parser.add_argument("--sizes", type=int, nargs="+",
+                        default=DEFAULT_BOARD_SIZES)
+    parser.add_argument("--dictionary-sizes", type=int, nargs="+",
+                        default=DEFAULT_DICTIONARY_SIZES)
+    parser.add_argument("--boards", type=int, default=1,
+                        help="boards per size")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="JSON file for the results")
+    args = parser.parse_args(argv)
+
+    if args.cores:
+        print("%-6s %7s %12s %12s %8s" % ("board", "words", "recursive",
+                                          "iterative", "speedup"))
+        for size, words, recursive, iterative in compare_cores():
+            print("%-6s %7d %11.2fms %11.2fms %7.2fx"
+                  % ("%dx%d" % (size, size), words, recursive * 1000,
+                     iterative * 1000, recursive / iterative))
+        return
+
+    records = run_suite(args.sizes, args.dictionary_sizes, args.boards,
+                        args.repeat, args.seed)
+    print_records(records)
+    if args.output:
+        write_results(records, args.output, board_sizes=args.sizes,
+                      dictionary_sizes=args.dictionary_sizes,
+                      boards_per_size=args.boards, repeat=args.repeat,
+                      seed=args.seed)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
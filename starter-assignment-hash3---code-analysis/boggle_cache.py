@@ -0,0 +1,153 @@
+"""
+LRU cache of Boggle solutions.
+
+Many boards are solved more than once: daily puzzles are requested again
+and again, and a board that is a rotation or mirror image of another has
+exactly the same words (moving between cells is unaffected by turning or
+flipping the board). SolutionCache keys each solution by:
+
+- the canonical form of the normalized grid: the smallest of its 8
+  rotations and reflections, so all of them share one entry,
+- the rules: min_len and allow_diagonals,
+- the fingerprint of the dictionary's word list.
+
+The cache holds at most ``maxsize`` entries and evicts the least recently
+used one. It counts hits, misses and evictions, and can be saved to and
+loaded from a JSON file.
+"""
+
+import json
+import os
+import tempfile
+from collections import OrderedDict
+
+CACHE_FORMAT_VERSION = 1
+
+
+def _rotate(grid):
+    """
+    Returns ``grid`` (a tuple of row tuples) turned 90 degrees clockwise.
+    """
+    return tuple(zip(*grid[::-1]))
+
+
+def canonical_grid(grid):
+    """
+    Returns the canonical form of a grid: the smallest of its 4 rotations
+    and their mirror images, as a tuple of row tuples.
+    """
+    current = tuple(tuple(row) for row in grid)
+    if not current or not current[0]:
+        return ()
+    variants = []
+    for _ in range(4):
+        variants.append(current)
+        variants.append(tuple(row[::-1] for row in current))
+        current = _rotate(current)
+    return min(variants)
+
+
+class SolutionCache:
+    """
+    Bounded LRU cache in front of Boggle.getSolution().
+    """
+
+    def __init__(self, maxsize=1024, path=None):
+        """
+        :param maxsize: Maximum number of cached solutions.
+        :param path: Optional JSON file. It is loaded here if it exists, and
+            written by save().
+        """
+        self.maxsize = maxsize
+        self.path = path
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        if path is not None and os.path.exists(path):
+            self.load(path)
+
+    def key(self, game):
+        """
+        Returns the cache key of a Boggle object's board and rules.
+        """
+        grid = [row[:game.cols] for row in game.grid]
+        return (canonical_grid(grid), game.min_len, game.allow_diagonals,
+                game.dictionary.fingerprint)
+
+    def get_solution(self, game):
+        """
+        Returns the sorted solution of ``game``, from the cache if possible.
+        """
+        key = self.key(game)
+        words = self.entries.get(key)
+        if words is not None:
+            self.hits += 1
+            self.entries.move_to_end(key)
+            return list(words)
+
+        self.misses += 1
+        words = game.getSolution()
+        self._store(key, tuple(words))
+        return words
+
+    def _store(self, key, words):
+        self.entries[key] = words
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.maxsize:
+            self.entries.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self):
+        self.entries.clear()
+
+    def __len__(self):
+        return len(self.entries)
+
+    def stats(self):
+        """
+        Returns the counters and current size as a dict.
+        """
+        return {"hits": self.hits, "misses": self.misses,
+                "evictions": self.evictions, "size": len(self.entries),
+                "maxsize": self.maxsize}
+
+    # ----------------------------------------------------------------------
+    # Persistence
+    # ----------------------------------------------------------------------
+    def save(self, path=None):
+        """
+        Writes the entries, least recently used first, to a JSON file. The
+        file is replaced atomically.
+        """
+        path = path or self.path
+        entries = [[[list(row) for row in grid], min_len, allow_diagonals,
+                    fingerprint, list(words)]
+                   for (grid, min_len, allow_diagonals, fingerprint), words
+                   in self.entries.items()]
+        directory = os.path.dirname(os.path.abspath(path))
+        fd, temp_path = tempfile.mkstemp(dir=directory, suffix=".json")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as out:
+                json.dump({"version": CACHE_FORMAT_VERSION,
+                           "entries": entries}, out)
+            os.replace(temp_path, path)
+        except BaseException:
+            os.unlink(temp_path)
+            raise
+
+    def load(self, path=None):
+        """
+        Adds the entries of a JSON file written by save(). Files of another
+        format version are ignored.
+        """
+        path = path or self.path
+        with open(path, encoding="utf-8") as source:
+            data = json.load(source)
+        if data.get("version") != CACHE_FORMAT_VERSION:
+            return
+        for entry in data["entries"]:
+            grid, min_len, allow_diagonals, fingerprint, words = entry
+            key = (tuple(tuple(row) for row in grid), min_len,
+                   allow_diagonals, fingerprint)
+            self._store(key, tuple(words))
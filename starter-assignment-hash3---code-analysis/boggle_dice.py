@@ -0,0 +1,44 @@
+"""
+Boggle dice, for rolling realistic random boards.
+
+The classic 16 dice are used as is, plus two extra dice carrying the "St"
+and "Ie" tiles that the course boards use (see the React app's
+Boggle_Solutions_Endpoint-2.json). Boards larger than 4x4 use as many full
+sets of dice as they need.
+"""
+
+# The 16 dice of the standard 4x4 game, one string of faces per die
+# ("Q" stands for the "Qu" face)
+CLASSIC_DICE = [
+    "AAEEGN", "ABBJOO", "ACHOPS", "AFFKPS", "AOOTTW", "CIMOTU", "DEILRX",
+    "DELRVY", "DISTTY", "EEGHNW", "EEINSU", "EHRTVW", "EIOSST", "ELRTTY",
+    "HIMNQU", "HLNNRZ",
+]
+# Extra dice carrying the other multi-letter tiles of the course boards
+MULTI_LETTER_DICE = [
+    ["St", "St", "E", "R", "A", "N"],
+    ["Ie", "Ie", "L", "T", "O", "N"],
+]
+
+
+def dice_faces():
+    """
+    Returns every die as a list of faces, with "Q" spelled "Qu".
+    """
+    dice = [["Qu" if face == "Q" else face for face in die]
+            for die in CLASSIC_DICE]
+    return dice + [list(die) for die in MULTI_LETTER_DICE]
+
+
+def dice_grid(size, rng):
+    """
+    Rolls a ``size`` x ``size`` board. The dice are shuffled into the cells
+    and each shows a random face; boards with more cells than dice use as
+    many full sets of dice as they need.
+    """
+    dice = dice_faces()
+    cells = size * size
+    pool = dice * (cells // len(dice) + 1)
+    rng.shuffle(pool)
+    faces = [rng.choice(die) for die in pool[:cells]]
+    return [faces[row * size:(row + 1) * size] for row in range(size)]
@@ -0,0 +1,305 @@
+"""
+Dictionary engines for the Boggle solver.
+
+An engine answers the two questions the DFS asks at every step: "is this a
+word?" and "can anything longer start with this?". Two engines ship here:
+
+- SetDictionary: the original implementation. Every word and every prefix
+  of every word is stored as its own Python string. Simple, and kept as the
+  reference the other engines are tested against.
+- TrieDictionary: a minimized DAWG (directed acyclic word graph) compiled
+  into flat arrays. Words that share prefixes share nodes, and words that
+  share suffixes share the nodes below them, so a large word list collapses
+  into a few hundred thousand integers instead of millions of strings.
+
+The trie engine is "walkable": the DFS keeps a node id and follows one edge
+per tile, instead of rebuilding and hashing the path string at every step.
+"""
+
+import hashlib
+from array import array
+
+
+def normalize_word(word):
+    """
+    Normalizes a dictionary word the same way the solver normalizes grid
+    cells: surrounding whitespace removed, uppercased.
+    """
+    return word.strip().upper()
+
+
+class DictionaryEngine:
+    """
+    Base class for dictionary engines. Subclasses must support membership
+    (``word in engine``), ``len()``, iteration over the words and
+    ``has_prefix``.
+
+    Engines that can be walked node by node set ``walkable`` to True and
+    provide ``ROOT``, ``child`` and ``is_word``.
+    """
+
+    walkable = False
+    _fingerprint = None
+
+    def has_prefix(self, prefix):
+        """
+        Returns True if ``prefix`` is a prefix of (or equal to) any word.
+        """
+        raise NotImplementedError
+
+    @property
+    def fingerprint(self):
+        """
+        Hex SHA-256 of the sorted word list. Engines holding the same words
+        have the same fingerprint, whatever their type. Computed on first
+        use.
+        """
+        if self._fingerprint is None:
+            digest = hashlib.sha256()
+            for word in self:
+                digest.update(word.encode("utf-8"))
+                digest.update(b"\n")
+            self._fingerprint = digest.hexdigest()
+        return self._fingerprint
+
+
+class SetDictionary(DictionaryEngine):
+    """
+    Reference engine: a set of words plus a set of all their prefixes.
+    """
+
+    def __init__(self, words):
+        """
+        :param words: An iterable of raw words. They are normalized here.
+        """
+        self.words = set(normalize_word(word) for word in words)
+        self.prefixes = self._build_prefix_set(self.words)
+
+    def _build_prefix_set(self, words):
+        """
+        Private method to precompute a set of all possible prefixes for the
+        dictionary words.
+        """
+        prefix_set = set()
+        for word in words:
+            for i in range(1, len(word) + 1):
+                prefix_set.add(word[:i])
+        return prefix_set
+
+    def __contains__(self, word):
+        return word in self.words
+
+    def __len__(self):
+        return len(self.words)
+
+    def __iter__(self):
+        return iter(sorted(self.words))
+
+    def has_prefix(self, prefix):
+        return prefix in self.prefixes
+
+
+class TrieDictionary(DictionaryEngine):
+    """
+    Minimized DAWG stored in compressed sparse row (CSR) form.
+
+    Node ``n`` owns the edges ``first[n]`` up to ``first[n + 1]``. For each
+    edge, ``labels`` holds its letter (one character of a str, so lookups
+    use ``str.find`` and run in C) and ``targets`` holds the node it leads
+    to. ``terminal[n]`` is 1 if a word ends at node ``n``. Node 0 is the
+    root.
+    """
+
+    walkable = True
+    ROOT = 0
+
+    def __init__(self, words):
+        """
+        :param words: An iterable of raw words. They are normalized here.
+        """
+        unique = sorted(set(normalize_word(word) for word in words))
+        self._size = len(unique)
+        self._compile(_build_dawg(unique))
+
+    @classmethod
+    def from_arrays(cls, first, labels, targets, terminal, size):
+        """
+        Wraps already compiled arrays (for example ones read back from an
+        on-disk index) without rebuilding anything.
+        """
+        engine = cls.__new__(cls)
+        engine.first = first
+        engine.labels = labels
+        engine.targets = targets
+        engine.terminal = terminal
+        engine._size = size
+        return engine
+
+    def _compile(self, root):
+        """
+        Flattens the builder nodes into the CSR arrays, numbering nodes in
+        breadth-first order so the root is node 0.
+        """
+        order = [root]
+        index = {id(root): 0}
+        i = 0
+        while i < len(order):
+            for child in order[i].edges.values():
+                if id(child) not in index:
+                    index[id(child)] = len(order)
+                    order.append(child)
+            i += 1
+
+        self.first = array("i", [0])
+        self.targets = array("i")
+        self.terminal = bytearray(len(order))
+        labels = []
+        for n, node in enumerate(order):
+            for letter, child in node.edges.items():
+                labels.append(letter)
+                self.targets.append(index[id(child)])
+            self.first.append(len(labels))
+            if node.final:
+                self.terminal[n] = 1
+        self.labels = "".join(labels)
+
+    # ----------------------------------------------------------------------
+    # Node Walking
+    # ----------------------------------------------------------------------
+    def child(self, node, letters):
+        """
+        Follows ``letters`` (a whole tile such as "QU") down from ``node``.
+
+        :return: The node reached, or -1 if there is no such path.
+        """
+        first = self.first
+        labels = self.labels
+        for letter in letters:
+            edge = labels.find(letter, first[node], first[node + 1])
+            if edge < 0:
+                return -1
+            node = self.targets[edge]
+        return node
+
+    def is_word(self, node):
+        """
+        Returns True if a dictionary word ends at ``node``.
+        """
+        return self.terminal[node] == 1
+
+    @property
+    def node_count(self):
+        return len(self.terminal)
+
+    # ----------------------------------------------------------------------
+    # DictionaryEngine Interface
+    # ----------------------------------------------------------------------
+    def __contains__(self, word):
+        node = self.child(self.ROOT, word)
+        return node >= 0 and self.is_word(node)
+
+    def __len__(self):
+        return self._size
+
+    def __iter__(self):
+        """
+        Yields every word in sorted order.
+        """
+        stack = [(self.ROOT, "")]
+        while stack:
+            node, word = stack.pop()
+            if self.terminal[node]:
+                yield word
+            # Push edges in reverse so the smallest letter is popped first
+            for edge in range(self.first[node + 1] - 1,
+                              self.first[node] - 1, -1):
+                stack.append((self.targets[edge], word + self.labels[edge]))
+
+    def has_prefix(self, prefix):
+        return self.child(self.ROOT, prefix) >= 0
+
+
+class _BuilderNode:
+    """
+    Mutable node used only while the DAWG is being built.
+    """
+
+    __slots__ = ("edges", "final")
+
+    def __init__(self):
+        self.edges = {}
+        self.final = False
+
+    def signature(self):
+        # Children are already minimized, so identity is equivalence
+        return (self.final,
+                tuple((letter, id(child))
+                      for letter, child in self.edges.items()))
+
+
+def _build_dawg(sorted_words):
+    """
+    Builds a minimized DAWG from sorted, unique words using the incremental
+    algorithm of Daciuk et al.: after each word, the part of the previous
+    word that can no longer change is merged with equivalent nodes.
+
+    :return: The root builder node.
+    """
+    root = _BuilderNode()
+    register = {}
+    unchecked = []  # (parent, letter, child) along the last inserted word
+
+    def minimize(down_to):
+        while len(unchecked) > down_to:
+            parent, letter, child = unchecked.pop()
+            key = child.signature()
+            if key in register:
+                parent.edges[letter] = register[key]
+            else:
+                register[key] = child
+
+    previous = ""
+    for word in sorted_words:
+        common = 0
+        for a, b in zip(word, previous):
+            if a != b:
+                break
+            common += 1
+        minimize(common)
+
+        node = unchecked[-1][2] if unchecked else root
+        for letter in word[common:]:
+            child = _BuilderNode()
+            node.edges[letter] = child
+            unchecked.append((node, letter, child))
+            node = child
+        node.final = True
+        previous = word
+
+    minimize(0)
+    return root
+
+
+ENGINES = {
+    "set": SetDictionary,
+    "trie": TrieDictionary,
+}
+
+DEFAULT_ENGINE = "trie"
+
+
+def build_dictionary(dictionary, engine=DEFAULT_ENGINE):
+    """
+    Returns a dictionary engine for ``dictionary``.
+
+    :param dictionary: Raw words, or an already built DictionaryEngine
+        (returned unchanged so one engine can be shared by many boards).
+    :param engine: Name of the engine class in ENGINES.
+    """
+    if isinstance(dictionary, DictionaryEngine):
+        return dictionary
+    try:
+        engine_class = ENGINES[engine]
+    except KeyError:
+        raise ValueError("Unknown dictionary engine: %r" % (engine,))
+    return engine_class(dictionary)
@@ -0,0 +1,232 @@
+"""
+Streaming export of solved boards.
+
+The React app reads boards from Boggle_Solutions_Endpoint-2.json: one JSON
+object whose values are {size, grid, solutions} records with lowercase
+tiles and words. Building that object in memory and dumping it at once
+holds every solution list at the same time. The writers here instead write
+each record as soon as BoggleBatchSolver produces it, so memory use stays
+flat however many boards are exported:
+
+- EndpointWriter: the endpoint format, one object keyed by board id.
+- JsonLinesWriter: one {id, size, grid, solutions} object per line.
+- ShardedWriter: splits the output into files of ``shard_size`` boards in
+  either format, and writes a small index.json listing the shards.
+
+export_solutions() connects a batch solver to any of them.
+"""
+
+import json
+import os
+
+from boggle_batch import BoggleBatchSolver, _numbered
+from boggle_dictionary import DEFAULT_ENGINE
+
+INDEX_FORMAT_VERSION = 1
+INDEX_NAME = "index.json"
+
+
+def endpoint_record(grid, words):
+    """
+    Returns the {size, grid, solutions} record of a solved board, with
+    lowercase tiles and words like the endpoint JSON.
+    """
+    return {
+        "size": len(grid),
+        "grid": [[tile.lower() for tile in row] for row in grid],
+        "solutions": [word.lower() for word in words],
+    }
+
+
+class JsonLinesWriter:
+    """
+    Writes one JSON record per line.
+    """
+
+    extension = ".jsonl"
+
+    def __init__(self, path):
+        self.path = path
+        self.count = 0
+        self._out = open(path, "w", encoding="utf-8")
+
+    def write(self, grid_id, grid, words):
+        record = {"id": grid_id}
+        record.update(endpoint_record(grid, words))
+        self._out.write(json.dumps(record))
+        self._out.write("\n")
+        self.count += 1
+
+    def close(self):
+        self._out.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class EndpointWriter(JsonLinesWriter):
+    """
+    Writes a single JSON object keyed by board id, in the schema of
+    Boggle_Solutions_Endpoint-2.json. The object is opened on creation and
+    closed by close().
+    """
+
+    extension = ".json"
+
+    def __init__(self, path):
+        super().__init__(path)
+        self._out.write("{")
+
+    def write(self, grid_id, grid, words):
+        if self.count:
+            self._out.write(",\n")
+        self._out.write(json.dumps(str(grid_id)))
+        self._out.write(": ")
+        self._out.write(json.dumps(endpoint_record(grid, words)))
+        self.count += 1
+
+    def close(self):
+        if not self._out.closed:
+            self._out.write("}\n")
+        super().close()
+
+
+FORMATS = {
+    "jsonl": JsonLinesWriter,
+    "endpoint": EndpointWriter,
+}
+
+
+def _writer_class(format):
+    try:
+        return FORMATS[format]
+    except KeyError:
+        raise ValueError("Unknown export format: %r" % (format,))
+
+
+class ShardedWriter:
+    """
+    Writes boards into numbered shard files of at most ``shard_size``
+    boards each, and on close() an index.json listing every shard with its
+    board count and first and last board id.
+    """
+
+    def __init__(self, directory, shard_size=1000, format="jsonl",
+                 prefix="boards"):
+        self.directory = directory
+        self.shard_size = shard_size
+        self.format = format
+        self.prefix = prefix
+        self.count = 0
+        self.shards = []
+        self._writer_class = _writer_class(format)
+        self._writer = None
+        os.makedirs(directory, exist_ok=True)
+
+    def write(self, grid_id, grid, words):
+        if self._writer is None:
+            name = "%s-%05d%s" % (self.prefix, len(self.shards),
+                                  self._writer_class.extension)
+            self._writer = self._writer_class(
+                os.path.join(self.directory, name))
+            self.shards.append({"file": name, "count": 0,
+                                "first_id": grid_id})
+        self._writer.write(grid_id, grid, words)
+        shard = self.shards[-1]
+        shard["count"] += 1
+        shard["last_id"] = grid_id
+        self.count += 1
+        if shard["count"] == self.shard_size:
+            self._writer.close()
+            self._writer = None
+
+    def close(self):
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+        index = {"version": INDEX_FORMAT_VERSION, "format": self.format,
+                 "count": self.count, "shard_size": self.shard_size,
+                 "shards": self.shards}
+        with open(os.path.join(self.directory, INDEX_NAME), "w",
+                  encoding="utf-8") as out:
+            json.dump(index, out, indent=2)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class _PendingGrids:
+    """
+    Feeds grids to BoggleBatchSolver.solve_many() while remembering the ones
+    still being solved, so each result can be written with its grid. Only
+    the boards in flight are held at any time.
+    """
+
+    def __init__(self, grids):
+        self.pairs = _numbered(grids)
+        self.grids = {}
+
+    def items(self):
+        for grid_id, grid in self.pairs:
+            self.grids[grid_id] = grid
+            yield grid_id, grid
+
+    def pop(self, grid_id):
+        return self.grids.pop(grid_id)
+
+
+def iter_read(path):
+    """
+    Yields (grid_id, record) pairs from a JSON Lines export, a sharded
+    export's directory, or (loading it whole) an endpoint JSON file.
+    """
+    if os.path.isdir(path):
+        with open(os.path.join(path, INDEX_NAME), encoding="utf-8") as source:
+            index = json.load(source)
+        for shard in index["shards"]:
+            yield from iter_read(os.path.join(path, shard["file"]))
+    elif path.endswith(JsonLinesWriter.extension):
+        with open(path, encoding="utf-8") as source:
+            for line in source:
+                record = json.loads(line)
+                yield record.pop("id"), record
+    else:
+        with open(path, encoding="utf-8") as source:
+            yield from json.load(source).items()
+
+
+def export_solutions(grids, dictionary, path, format="jsonl",
+                     shard_size=None, workers=None, engine=DEFAULT_ENGINE,
+                     **options):
+    """
+    Solves ``grids`` with a BoggleBatchSolver and streams the results to
+    ``path``. Records are written in the order boards finish.
+
+    :param grids: A mapping of grid_id to grid, or an iterable of grids
+        (whose ids are then their positions). Generators are consumed
+        lazily.
+    :param dictionary: Raw words or a prebuilt dictionary engine.
+    :param path: Output file, or a directory if ``shard_size`` is given.
+    :param format: "jsonl" or "endpoint".
+    :param shard_size: If given, write shards of this many boards plus an
+        index file into the directory ``path``.
+    :param workers: Worker processes for the batch solver.
+    :param options: Extra BoggleBatchSolver options (min_len, ...).
+    :return: The number of boards written.
+    """
+    if shard_size is not None:
+        writer = ShardedWriter(path, shard_size, format)
+    else:
+        writer = _writer_class(format)(path)
+    solver = BoggleBatchSolver(dictionary, workers, engine=engine, **options)
+    pending = _PendingGrids(grids)
+    with writer:
+        for grid_id, words in solver.solve_many(pending):
+            writer.write(grid_id, pending.pop(grid_id), words)
+    return writer.count
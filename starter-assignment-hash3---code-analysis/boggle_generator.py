@@ -0,0 +1,222 @@
+"""
+Offline generator of Boggle boards that meet difficulty targets.
+
+Daily puzzles need boards with, for example, at least 150 words and a few
+long ones. generate_board() starts from a board rolled from the dice
+(boggle_dice.py) and improves it by simulated annealing: each step rerolls
+one cell, re-solves the board incrementally with Boggle.update_cell(), and
+keeps the change if it brings the board closer to the target (or, early
+on, sometimes even if it does not). A BoardTarget without a word-count
+range simply maximizes the number of words.
+
+generate_boards() runs many independent searches on a process pool, and
+write_endpoint_json() stores the boards in the same {size, grid, solutions}
+schema as the React app's Boggle_Solutions_Endpoint-2.json.
+
+Run it directly:
+
+    python3 boggle_generator.py --size 4 --count 10 --min-words 150 \
+        --min-long-words 2 --output boards.json
+"""
+
+import argparse
+import math
+import os
+import random
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+from boggle_batch import restore_engine, shareable_engine
+from boggle_benchmark import load_wordlist
+from boggle_dice import dice_faces, dice_grid
+from boggle_dictionary import DEFAULT_ENGINE, build_dictionary
+from boggle_export import EndpointWriter
+from boggle_solver import Boggle
+
+
+class BoardTarget:
+    """
+    What a generated board should look like.
+    """
+
+    def __init__(self, min_words=None, max_words=None, long_word_len=7,
+                 min_long_words=0):
+        """
+        :param min_words: Fewest words the board may have. If neither this
+            nor ``max_words`` is given, the word count is maximized.
+        :param max_words: Most words the board may have.
+        :param long_word_len: Letters a word needs to count as long.
+        :param min_long_words: Fewest long words the board must have.
+        """
+        self.min_words = min_words
+        self.max_words = max_words
+        self.long_word_len = long_word_len
+        self.min_long_words = min_long_words
+
+    def cost(self, solution):
+        """
+        Returns how far a solution is from the target; 0 (or less, when
+        maximizing) means the target is met.
+        """
+        count = len(solution)
+        long_words = sum(1 for word in solution
+                         if len(word) >= self.long_word_len)
+        # A missing long word weighs as much as ten missing words
+        cost = 10 * max(0, self.min_long_words - long_words)
+        if self.min_words is None and self.max_words is None:
+            return cost - count
+        if self.min_words is not None:
+            cost += max(0, self.min_words - count)
+        if self.max_words is not None:
+            cost += max(0, count - self.max_words)
+        return cost
+
+    def is_met(self, solution):
+        if self.min_words is None and self.max_words is None:
+            return False  # Maximizing: never stop early
+        return self.cost(solution) <= 0
+
+
+def generate_board(size, dictionary, target, rng, steps=2000,
+                   start_temperature=2.0, end_temperature=0.05, **options):
+    """
+    Searches for one board by simulated annealing.
+
+    :param size: Board width and height.
+    :param dictionary: Words or a prebuilt dictionary engine.
+    :param target: A BoardTarget.
+    :param rng: random.Random used for every choice.
+    :param steps: Most cells rerolled before giving up.
+    :param start_temperature: Initial temperature; cost increases of about
+        this size are accepted with probability 1/e.
+    :param end_temperature: Temperature reached at the last step.
+    :param options: Extra Boggle options (min_len, allow_diagonals).
+    :return: A (grid, sorted words, cost) tuple for the best board seen.
+    """
+    faces = [face for die in dice_faces() for face in die]
+    game = Boggle(dice_grid(size, rng), dictionary, core="iterative",
+                  **options)
+    cost = target.cost(game.getSolution())
+    best = ([list(row) for row in game.grid], sorted(game.solution), cost)
+    cooling = (end_temperature / start_temperature) ** (1.0 / max(1, steps))
+    temperature = start_temperature
+
+    for _ in range(steps):
+        if target.is_met(best[1]):
+            break
+        row, col = rng.randrange(size), rng.randrange(size)
+        old_tile = game.grid[row][col]
+        new_tile = rng.choice(faces)
+        if new_tile.upper() == old_tile:
+            continue
+        game.update_cell(row, col, new_tile)
+        new_cost = target.cost(game.solution)
+        delta = new_cost - cost
+        if delta <= 0 or rng.random() < math.exp(-delta / temperature):
+            cost = new_cost
+            if cost < best[2]:
+                best = ([list(row) for row in game.grid],
+                        sorted(game.solution), cost)
+        else:
+            game.update_cell(row, col, old_tile)  # Undo
+        temperature *= cooling
+    return best
+
+
+# Per-process dictionary engine, set up by _init_worker
+_worker_engine = None
+
+
+def _init_worker(engine, index_path):
+    global _worker_engine
+    _worker_engine = restore_engine(engine, index_path)
+
+
+def _generate_task(task):
+    size, seed, target, steps, options = task
+    grid, words, cost = generate_board(size, _worker_engine, target,
+                                       random.Random(seed), steps, **options)
+    return seed, grid, words, cost
+
+
+def generate_boards(count, size, dictionary, target, workers=None, seed=0,
+                    steps=2000, engine=DEFAULT_ENGINE, **options):
+    """
+    Generates ``count`` boards in parallel, one annealing run per board.
+    Run ``i`` is seeded with ``seed + i``, so results are reproducible.
+
+    :param workers: Worker processes; defaults to the CPU count. With 1,
+        boards are generated in this process.
+    :return: A generator of records {"size", "grid", "solutions", "cost",
+        "seed"}, in the order the runs were started.
+    """
+    dictionary = build_dictionary(dictionary, engine)
+    workers = workers or os.cpu_count() or 1
+    tasks = [(size, seed + i, target, steps, options) for i in range(count)]
+
+    if workers == 1:
+        _init_worker(dictionary, None)
+        results = map(_generate_task, tasks)
+        for result in results:
+            yield _record(size, *result)
+        return
+
+    engine_arg, index_path = shareable_engine(dictionary)
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(engine_arg, index_path)) as pool:
+        for result in pool.map(_generate_task, tasks):
+            yield _record(size, *result)
+
+
+def _record(size, seed, grid, words, cost):
+    return {"size": size, "grid": grid, "solutions": words, "cost": cost,
+            "seed": seed}
+
+
+def write_endpoint_json(records, path):
+    """
+    Writes records as a JSON object keyed "0", "1", ... whose values follow
+    the {size, grid, solutions} schema of Boggle_Solutions_Endpoint-2.json.
+    Records are streamed, so ``records`` may be a generator.
+    """
+    with EndpointWriter(path) as writer:
+        for i, record in enumerate(records):
+            writer.write(i, record["grid"], record["solutions"])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--size", type=int, default=4)
+    parser.add_argument("--count", type=int, default=1)
+    parser.add_argument("--min-words", type=int)
+    parser.add_argument("--max-words", type=int)
+    parser.add_argument("--long-word-len", type=int, default=7)
+    parser.add_argument("--min-long-words", type=int, default=0)
+    parser.add_argument("--steps", type=int, default=2000)
+    parser.add_argument("--workers", type=int)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="endpoint-style JSON file")
+    args = parser.parse_args(argv)
+
+    target = BoardTarget(args.min_words, args.max_words, args.long_word_len,
+                         args.min_long_words)
+    records = _printed(generate_boards(args.count, args.size,
+                                       load_wordlist(), target, args.workers,
+                                       args.seed, args.steps))
+    if args.output:
+        write_endpoint_json(records, args.output)
+    else:
+        for _ in records:
+            pass
+
+
+def _printed(records):
+    for record in records:
+        print("seed %d: %d words, cost %d, %s" % (
+            record["seed"], len(record["solutions"]), record["cost"],
+            " ".join("".join(row) for row in record["grid"])))
+        yield record
+
+
+if __name__ == "__main__":
+    sys.exit(main())
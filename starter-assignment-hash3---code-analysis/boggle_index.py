@@ -0,0 +1,202 @@
+"""
+Persistent on-disk dictionary index for the Boggle solver.
+
+Building a TrieDictionary from a large word list takes seconds. This module
+writes the compiled arrays to a versioned binary file once, and later
+processes open it with mmap instead of rebuilding it. The integer arrays
+are used straight from the mapped pages, so any number of worker processes
+share one copy of them through the OS page cache.
+
+The file records the SHA-256 checksum of the word list it was built from.
+load_dictionary() rebuilds the index whenever the word list changes, the
+format version changes, or the file is missing or damaged.
+
+File layout (little-endian, every section starts on a 4-byte boundary):
+
+    header    struct HEADER_FORMAT
+    first     int32 * (node_count + 1)
+    targets   int32 * edge_count
+    terminal  uint8 * node_count
+    labels    UTF-8 text, labels_size bytes (one character per edge)
+"""
+
+import hashlib
+import mmap
+import os
+import struct
+import sys
+import tempfile
+
+from boggle_dictionary import TrieDictionary
+
+MAGIC = b"BOGDAWG\0"
+FORMAT_VERSION = 1
+# magic, version, checksum, node_count, edge_count, word_count, labels_size
+HEADER_FORMAT = "<8sI32sIIII"
+HEADER_SIZE = struct.calcsize(HEADER_FORMAT)
+INDEX_SUFFIX = ".idx"
+
+
+class StaleIndexError(Exception):
+    """
+    Raised when an index file is missing, damaged or out of date.
+    """
+
+
+def file_checksum(path):
+    """
+    Returns the SHA-256 digest of the file at ``path``.
+    """
+    digest = hashlib.sha256()
+    with open(path, "rb") as source:
+        for block in iter(lambda: source.read(1 << 20), b""):
+            digest.update(block)
+    return digest.digest()
+
+
+def read_words(path):
+    """
+    Yields the non-blank lines of a UTF-8 word list, one word per line.
+    """
+    with open(path, encoding="utf-8") as source:
+        for line in source:
+            if line.strip():
+                yield line
+
+
+def _align(offset):
+    return (offset + 3) & ~3
+
+
+def write_index(engine, index_path, checksum):
+    """
+    Writes a compiled TrieDictionary to ``index_path``.
+
+    The file is written to a temporary name and renamed into place, so
+    readers never see a half-written index.
+
+    :param engine: The TrieDictionary to store.
+    :param index_path: Destination file.
+    :param checksum: SHA-256 digest of the source word list.
+    """
+    first = engine.first.tobytes()
+    targets = engine.targets.tobytes()
+    terminal = bytes(engine.terminal)
+    labels = engine.labels.encode("utf-8")
+    if sys.byteorder != "little":
+        first = _byteswapped(engine.first)
+        targets = _byteswapped(engine.targets)
+
+    header = struct.pack(HEADER_FORMAT, MAGIC, FORMAT_VERSION, checksum,
+                         engine.node_count, len(engine.targets), len(engine),
+                         len(labels))
+
+    directory = os.path.dirname(os.path.abspath(index_path))
+    fd, temp_path = tempfile.mkstemp(dir=directory, suffix=INDEX_SUFFIX)
+    try:
+        with os.fdopen(fd, "wb") as out:
+            offset = 0
+            for section in (header, first, targets, terminal, labels):
+                padding = _align(offset) - offset
+                out.write(b"\0" * padding)
+                out.write(section)
+                offset += padding + len(section)
+        os.replace(temp_path, index_path)
+    except BaseException:
+        os.unlink(temp_path)
+        raise
+
+
+def _byteswapped(values):
+    swapped = values.__copy__()
+    swapped.byteswap()
+    return swapped.tobytes()
+
+
+def open_index(index_path, checksum=None):
+    """
+    Opens an index file through mmap and returns a TrieDictionary backed by
+    the mapped pages.
+
+    :param index_path: The index file.
+    :param checksum: If given, the index must have been built from a word
+        list with this SHA-256 digest.
+    :raises StaleIndexError: If the file is missing, damaged, of another
+        format version, or was built from a different word list.
+    """
+    if sys.byteorder != "little":
+        raise StaleIndexError("Mapped indexes require a little-endian host")
+    try:
+        with open(index_path, "rb") as source:
+            mapped = mmap.mmap(source.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError) as error:
+        raise StaleIndexError("Cannot map %s: %s" % (index_path, error))
+
+    if len(mapped) < HEADER_SIZE:
+        mapped.close()
+        raise StaleIndexError("Truncated index: %s" % index_path)
+    (magic, version, stored_checksum, node_count, edge_count, word_count,
+     labels_size) = struct.unpack_from(HEADER_FORMAT, mapped)
+    if magic != MAGIC or version != FORMAT_VERSION:
+        mapped.close()
+        raise StaleIndexError("Unsupported index format: %s" % index_path)
+    if checksum is not None and stored_checksum != checksum:
+        mapped.close()
+        raise StaleIndexError("Index is out of date: %s" % index_path)
+
+    view = memoryview(mapped)
+    sections = []
+    offset = HEADER_SIZE
+    for size in ((node_count + 1) * 4, edge_count * 4, node_count,
+                 labels_size):
+        offset = _align(offset)
+        sections.append(view[offset:offset + size])
+        offset += size
+    if offset > len(mapped):
+        view.release()
+        mapped.close()
+        raise StaleIndexError("Truncated index: %s" % index_path)
+
+    first, targets, terminal, labels = sections
+    engine = TrieDictionary.from_arrays(
+        first.cast("i"), bytes(labels).decode("utf-8"), targets.cast("i"),
+        terminal, word_count)
+    labels.release()
+    # Keep the mapping alive for as long as the engine uses its pages, and
+    # remember where it came from so other processes can map it too
+    engine.mapped = mapped
+    engine.index_path = index_path
+    return engine
+
+
+def build_index(source_path, index_path=None):
+    """
+    Builds the index for a word list file and writes it next to it (or to
+    ``index_path``).
+
+    :return: The path of the written index.
+    """
+    index_path = index_path or source_path + INDEX_SUFFIX
+    checksum = file_checksum(source_path)
+    write_index(TrieDictionary(read_words(source_path)), index_path,
+                checksum)
+    return index_path
+
+
+def load_dictionary(source_path, index_path=None):
+    """
+    Returns a mapped TrieDictionary for the word list at ``source_path``,
+    building or rebuilding its index first if it is missing or stale.
+
+    :param source_path: UTF-8 word list, one word per line.
+    :param index_path: Index location. Defaults to the word list path with
+        INDEX_SUFFIX appended.
+    """
+    index_path = index_path or source_path + INDEX_SUFFIX
+    checksum = file_checksum(source_path)
+    try:
+        return open_index(index_path, checksum)
+    except StaleIndexError:
+        write_index(TrieDictionary(read_words(source_path)), index_path,
+                    checksum)
+        return open_index(index_path, checksum)
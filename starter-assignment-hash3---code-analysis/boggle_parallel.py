@@ -0,0 +1,87 @@
+"""
+Parallel search of a single, very large Boggle board.
+
+Every start cell's DFS is independent of the others, so one board can be
+split by start cell across worker processes. Each worker receives the board
+and dictionary once (pool initializer) and then solves chunks of start
+cells, returning the words it found; the parent merges them into one set.
+
+Search cost is far from uniform across a board: cells holding common
+letters in letter-rich regions dominate. To keep every worker busy the
+start cells are dealt round-robin into many small chunks (so a dense region
+is spread over several chunks), and idle workers pull the next chunk from
+the pool's queue as soon as they finish one.
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from boggle_batch import restore_engine, shareable_engine
+from boggle_solver import Boggle
+
+# Chunks created per worker; more chunks balance better but cost more IPC
+CHUNKS_PER_WORKER = 8
+
+# Per-process solver for the board being searched, set up by _init_worker
+_worker_game = None
+
+
+def _init_worker(grid, engine, index_path, options):
+    """
+    Pool initializer: builds the Boggle object for the shared board.
+    """
+    global _worker_game
+    _worker_game = Boggle(grid, restore_engine(engine, index_path),
+                          **options)
+
+
+def _solve_starts(starts):
+    """
+    Searches from the given start cells and returns the words found.
+    """
+    _worker_game.solution = set()
+    _worker_game.findAllWords(starts)
+    return _worker_game.solution
+
+
+def start_chunks(cell_count, chunk_count):
+    """
+    Deals cells 0..cell_count-1 round-robin into ``chunk_count`` chunks,
+    so neighboring (and similarly expensive) cells land in different
+    chunks.
+    """
+    chunk_count = max(1, min(chunk_count, cell_count))
+    return [range(i, cell_count, chunk_count) for i in range(chunk_count)]
+
+
+def solve_parallel(game, workers=None, chunks_per_worker=CHUNKS_PER_WORKER):
+    """
+    Solves ``game``'s board with its start cells spread over a process
+    pool. The result is identical to ``game.getSolution()``, and like it,
+    the words are also left in ``game.solution``.
+
+    :param game: A Boggle object.
+    :param workers: Number of worker processes. Defaults to the CPU count.
+    :param chunks_per_worker: Start-cell chunks created per worker.
+    :return: The sorted list of words.
+    """
+    workers = workers or os.cpu_count() or 1
+    cell_count = game.rows * game.cols
+    game.solution.clear()
+    if workers == 1 or cell_count < 2:
+        game.findAllWords()
+        return sorted(game.solution)
+
+    engine, index_path = shareable_engine(game.dictionary)
+    options = {"min_len": game.min_len,
+               "allow_diagonals": game.allow_diagonals,
+               "engine": game.engine,
+               "core": game.core}
+    chunks = start_chunks(cell_count, workers * chunks_per_worker)
+    with ProcessPoolExecutor(max_workers=workers,
+                             initializer=_init_worker,
+                             initargs=(game.grid, engine, index_path,
+                                       options)) as pool:
+        for words in pool.map(_solve_starts, chunks):
+            game.solution.update(words)
+    return sorted(game.solution)
@@ -0,0 +1,287 @@
+"""
+Asyncio solver service.
+
+The React app reads its boards from a static JSON file. BoggleService
+answers the same {size, grid, solutions} records live:
+
+    POST /solve   body {"grid": [["a", "b"], ...]}  ->  endpoint record
+    GET  /stats   request, solve and latency counters
+
+Solving runs in a bounded process pool (the workers of boggle_batch.py), so
+the event loop never blocks on a DFS. Identical boards requested while one
+of them is being solved share that solve; rotations and mirror images
+count as identical, since they have the same words (see boggle_cache.py).
+At most ``max_pending`` distinct boards are queued or solving at once;
+beyond that, requests are refused at once with status 503 instead of
+piling up.
+
+handle() is independent of any transport. serve() puts it behind a
+minimal HTTP/1.1 server, and LocalClient calls it directly, for tests and
+for embedding the service in another program.
+"""
+
+import asyncio
+import json
+import math
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from boggle_batch import _init_worker, _solve_chunk, shareable_engine
+from boggle_benchmark import load_wordlist
+from boggle_cache import canonical_grid
+from boggle_dictionary import DEFAULT_ENGINE, build_dictionary
+from boggle_export import endpoint_record
+from boggle_solver import Boggle
+
+DEFAULT_MAX_PENDING = 64
+# Number of recent request latencies kept for the percentiles
+LATENCY_SAMPLES = 10000
+
+STATUS_TEXT = {200: "OK", 400: "Bad Request", 404: "Not Found",
+               503: "Service Unavailable"}
+
+
+class ServiceBusy(Exception):
+    """
+    Raised when the service already has ``max_pending`` boards to solve.
+    """
+
+
+def percentile(samples, fraction):
+    """
+    Returns the nearest-rank percentile of ``samples`` (0 < fraction <= 1),
+    or None if there are none.
+    """
+    if not samples:
+        return None
+    ordered = sorted(samples)
+    return ordered[max(0, math.ceil(fraction * len(ordered)) - 1)]
+
+
+class BoggleService:
+    """
+    Solves boards for concurrent asyncio callers.
+    """
+
+    def __init__(self, dictionary, workers=None,
+                 max_pending=DEFAULT_MAX_PENDING,
+                 min_len=Boggle.DEFAULT_MIN_LEN, allow_diagonals=True,
+                 engine=DEFAULT_ENGINE, core="iterative"):
+        """
+        :param dictionary: Raw words or a prebuilt dictionary engine.
+        :param workers: Worker processes; defaults to the CPU count.
+        :param max_pending: Most distinct boards queued or solving at once.
+        :param min_len: The minimum required length for a word.
+        :param allow_diagonals: If True, diagonal moves are allowed.
+        :param engine: Dictionary engine name, used if ``dictionary`` is a
+            word list.
+        :param core: Search core used by the workers (see Boggle.CORES).
+        """
+        self.dictionary = build_dictionary(dictionary, engine)
+        self.workers = workers or os.cpu_count() or 1
+        self.max_pending = max_pending
+        if core == "iterative" and not self.dictionary.walkable:
+            core = "recursive"
+        self.options = {"min_len": min_len,
+                        "allow_diagonals": allow_diagonals,
+                        "core": core}
+        self.pool = None
+        self.pending = {}  # canonical grid -> asyncio.Future of the words
+        self.latencies = deque(maxlen=LATENCY_SAMPLES)
+        self.requests = 0
+        self.solves = 0
+        self.coalesced = 0
+        self.rejected = 0
+
+    async def start(self):
+        engine, index_path = shareable_engine(self.dictionary)
+        self.pool = ProcessPoolExecutor(max_workers=self.workers,
+                                        initializer=_init_worker,
+                                        initargs=(engine, index_path,
+                                                  self.options))
+
+    async def close(self):
+        if self.pool is not None:
+            self.pool.shutdown(wait=True)
+            self.pool = None
+
+    async def __aenter__(self):
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    # ----------------------------------------------------------------------
+    # Solving
+    # ----------------------------------------------------------------------
+    async def solve(self, grid):
+        """
+        Returns the sorted words of ``grid``, sharing the solve with any
+        identical board already pending.
+
+        :raises ServiceBusy: If ``max_pending`` boards are already pending.
+        """
+        if self.pool is None:
+            raise RuntimeError("BoggleService.start() has not been called")
+        started = time.perf_counter()
+        self.requests += 1
+        grid = [[cell.upper() for cell in row] for row in grid]
+        key = canonical_grid(grid)
+        future = self.pending.get(key)
+        if future is not None:
+            self.coalesced += 1
+        else:
+            if len(self.pending) >= self.max_pending:
+                self.rejected += 1
+                raise ServiceBusy("%d boards already pending"
+                                  % len(self.pending))
+            future = asyncio.ensure_future(self._solve(key, grid))
+            self.pending[key] = future
+        # shield: one caller being cancelled must not cancel the others
+        words = await asyncio.shield(future)
+        self.latencies.append(time.perf_counter() - started)
+        return list(words)
+
+    async def _solve(self, key, grid):
+        try:
+            loop = asyncio.get_running_loop()
+            [(_, words)] = await loop.run_in_executor(
+                self.pool, _solve_chunk, [(None, grid)])
+            self.solves += 1
+            return words
+        finally:
+            del self.pending[key]
+
+    def stats(self):
+        """
+        Returns the request counters and the p50/p99 latency, in seconds,
+        of the last LATENCY_SAMPLES answered requests.
+        """
+        return {"requests": self.requests, "solves": self.solves,
+                "coalesced": self.coalesced, "rejected": self.rejected,
+                "pending": len(self.pending),
+                "p50_seconds": percentile(self.latencies, 0.50),
+                "p99_seconds": percentile(self.latencies, 0.99)}
+
+    # ----------------------------------------------------------------------
+    # Requests
+    # ----------------------------------------------------------------------
+    async def handle(self, method, path, body=None):
+        """
+        Answers one request.
+
+        :param method: "GET" or "POST".
+        :param path: "/solve" or "/stats".
+        :param body: The decoded JSON body of a POST, or None.
+        :return: A (status, JSON-serializable payload) pair.
+        """
+        if method == "GET" and path == "/stats":
+            return 200, self.stats()
+        if method != "POST" or path != "/solve":
+            return 404, {"error": "no route for %s %s" % (method, path)}
+
+        grid = body.get("grid") if isinstance(body, dict) else None
+        if (not isinstance(grid, list) or
+                not all(isinstance(row, list) and
+                        all(isinstance(cell, str) for cell in row)
+                        for row in grid)):
+            return 400, {"error": "body must be {\"grid\": [[str, ...]]}"}
+        try:
+            words = await self.solve(grid)
+        except ServiceBusy as error:
+            return 503, {"error": str(error)}
+        return 200, endpoint_record(grid, words)
+
+
+class LocalClient:
+    """
+    Stand-in for an HTTP client: sends requests straight to a service's
+    handle(), encoding and decoding the JSON as a real client would.
+    """
+
+    def __init__(self, service):
+        self.service = service
+
+    async def request(self, method, path, payload=None):
+        body = None if payload is None else json.loads(json.dumps(payload))
+        status, answer = await self.service.handle(method, path, body)
+        return status, json.loads(json.dumps(answer))
+
+    async def solve(self, grid):
+        return await self.request("POST", "/solve", {"grid": grid})
+
+    async def stats(self):
+        return await self.request("GET", "/stats")
+
+
+# --------------------------------------------------------------------------
+# HTTP Transport
+# --------------------------------------------------------------------------
+async def _read_request(reader):
+    """
+    Reads one HTTP/1.1 request and returns (method, path, decoded body).
+    Raises ValueError if it is malformed.
+    """
+    request_line = (await reader.readline()).decode("latin-1").split()
+    if len(request_line) != 3:
+        raise ValueError("malformed request line")
+    method, path, _ = request_line
+    length = 0
+    while True:
+        line = (await reader.readline()).decode("latin-1").strip()
+        if not line:
+            break
+        name, _, value = line.partition(":")
+        if name.strip().lower() == "content-length":
+            length = int(value)
+    body = await reader.readexactly(length) if length else b""
+    return method, path, json.loads(body) if body else None
+
+
+async def _handle_connection(service, reader, writer):
+    try:
+        try:
+            method, path, body = await _read_request(reader)
+        except (ValueError, asyncio.IncompleteReadError):
+            status, answer = 400, {"error": "malformed request"}
+        else:
+            status, answer = await service.handle(method, path, body)
+        payload = json.dumps(answer).encode("utf-8")
+        headers = ["HTTP/1.1 %d %s" % (status, STATUS_TEXT[status]),
+                   "Content-Type: application/json",
+                   "Content-Length: %d" % len(payload),
+                   "Connection: close"]
+        if status == 503:
+            headers.append("Retry-After: 1")
+        writer.write(("\r\n".join(headers) + "\r\n\r\n").encode("latin-1"))
+        writer.write(payload)
+        await writer.drain()
+    finally:
+        writer.close()
+
+
+async def serve(service, host="127.0.0.1", port=8000):
+    """
+    Starts an HTTP server for ``service`` and returns the asyncio server.
+    The service must already be started.
+    """
+    return await asyncio.start_server(
+        lambda reader, writer: _handle_connection(service, reader, writer),
+        host, port)
+
+
+async def _main(port):
+    async with BoggleService(load_wordlist()) as service:
+        server = await serve(service, port=port)
+        print("Serving on port %d" % port)
+        async with server:
+            await server.serve_forever()
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(_main(int(sys.argv[1]) if len(sys.argv) > 1
+                                else 8000)))
@@ -4,9 +4,11 @@ Depth First Search (DFS).
 
 
 The solver works by traversing an N x M grid of letters (or multi-letter
-cells like "Qu"). It uses a pre-built prefix set derived from the
-dictionary for efficient pruning during the DFS, ensuring that only paths
-that can form a known word are explored.
+cells like "Qu"). It uses a pre-built dictionary engine (see
+boggle_dictionary.py) for efficient pruning during the DFS, ensuring that
+only paths that can form a known word are explored. The default engine is a
+compiled trie that the DFS walks node by node; the original prefix-set
+engine is still available as ``engine="set"``.
 
 Inputs:
 - grid: A list of lists representing the Boggle board. All cells are
@@ -22,26 +24,51 @@ Rules:
 - Words must meet a minimum length (default is 3).
 """
 
+import cProfile
+import time
+from array import array
+
+from boggle_dictionary import DEFAULT_ENGINE, build_dictionary
+from boggle_stats import SearchStats
+
+# Search steps between two clock reads when a deadline is set
+DEADLINE_CHECK_INTERVAL = 256
+
 
 class Boggle:
     # Class constant for default minimum word length
     DEFAULT_MIN_LEN = 3
+    # Search cores: the original recursive DFS, or the iterative one that
+    # uses an explicit stack, an adjacency table and a visited bitmask
+    CORES = ("recursive", "iterative")
 
     def __init__(self, grid, dictionary, min_len=DEFAULT_MIN_LEN,
-                 allow_diagonals=True):
+                 allow_diagonals=True, engine=DEFAULT_ENGINE,
+                 core="recursive"):
         """
         Initializes the Boggle game instance.
 
         :param grid: The Boggle board (list of lists of strings).
-        :param dictionary: A list or set of valid words.
+        :param dictionary: A list or set of valid words, or an already
+            built dictionary engine.
         :param min_len: The minimum required length for a word.
         :param allow_diagonals: If True, diagonal moves are allowed.
+        :param engine: Dictionary engine name ("trie" or "set").
+        :param core: Search core, one of CORES. The iterative core needs a
+            walkable engine.
         """
+        if core not in self.CORES:
+            raise ValueError("Unknown search core: %r" % (core,))
+        self.engine = engine
+        self.core = core
         self.setGrid(grid)
         self.setDictionary(dictionary)
         self.min_len = min_len
         self.allow_diagonals = allow_diagonals
         self.solution = set()  # Stores found words
+        self.complete = False  # Whether the last search covered every cell
+        self.stats = None  # SearchStats of the last instrumented solve
+        self._instrumentation = None  # (counters, callback, profile_path)
 
     # ----------------------------------------------------------------------
     # Grid Setup Methods
@@ -66,28 +93,61 @@ class Boggle:
         self.visited = [[False for _ in range(self.cols)]
                         for _ in range(self.rows)]
 
+        # Neighbor table for the iterative core, built on first use
+        self._adjacency = None
+        self._adjacency_diagonals = None
+        # Whether self.solution holds the full solution of this grid
+        self._solved = False
+        # Per-start-cell state kept by update_cell (see _solve_tracked)
+        self._tracking = None
+
+    def _tiles(self):
+        """
+        Returns the tiles of the grid as a flat list in row-major order, so
+        cell number ``row * cols + col`` holds ``grid[row][col]``.
+        """
+        return [tile for row in self.grid for tile in row[:self.cols]]
+
+    def _get_adjacency(self):
+        """
+        Returns a tuple with, for every cell (numbered row-major), the tuple
+        of its in-bounds neighbor cells under the current allow_diagonals
+        rule. It is computed once per grid and rule.
+        """
+        if (self._adjacency is None or
+                self._adjacency_diagonals != self.allow_diagonals):
+            adjacency = []
+            for row in range(self.rows):
+                for col in range(self.cols):
+                    neighbors = []
+                    for drow in (-1, 0, 1):
+                        for dcol in (-1, 0, 1):
+                            if drow == 0 and dcol == 0:
+                                continue
+                            if (not self.allow_diagonals and drow != 0 and
+                                    dcol != 0):
+                                continue
+                            nrow, ncol = row + drow, col + dcol
+                            if (0 <= nrow < self.rows and
+                                    0 <= ncol < self.cols):
+                                neighbors.append(nrow * self.cols + ncol)
+                    adjacency.append(tuple(neighbors))
+            self._adjacency = tuple(adjacency)
+            self._adjacency_diagonals = self.allow_diagonals
+        return self._adjacency
+
     # ----------------------------------------------------------------------
     # Dictionary and Prefix Methods
     # ----------------------------------------------------------------------
     def setDictionary(self, dictionary):
         """
-        Normalizes the dictionary and builds the prefix set for efficient
-        search. Whitespace is stripped from each word for robustness.
-        """
-        # Normalize, strip whitespace, and convert to a set for O(1) lookups
-        self.dictionary = set(word.strip().upper() for word in dictionary)
-        self.prefix_set = self._build_prefix_set(self.dictionary)
-
-    def _build_prefix_set(self, dictionary):
-        """
-        Private method to precompute a set of all possible prefixes for the
-        dictionary words.
+        Normalizes the dictionary and builds the configured engine for
+        efficient search. Whitespace is stripped from each word for
+        robustness. A prebuilt engine is used as is.
         """
-        prefix_set = set()
-        for word in dictionary:
-            for i in range(1, len(word) + 1):
-                prefix_set.add(word[:i])
-        return prefix_set
+        self.dictionary = build_dictionary(dictionary, self.engine)
+        self._solved = False
+        self._tracking = None
 
     # ----------------------------------------------------------------------
     # Solution Retrieval and Validation
@@ -100,6 +160,7 @@ class Boggle:
         """
         self.solution.clear()  # Clear any previous solutions for a fresh start
         self.findAllWords()
+        self._solved = self.complete = True
         return sorted(list(self.solution))
 
     def isValidWord(self, word):
@@ -113,22 +174,61 @@ class Boggle:
         """
         Checks if a path is a valid prefix of any word in the dictionary.
         """
-        return prefix in self.prefix_set
+        return self.dictionary.has_prefix(prefix)
 
     # ----------------------------------------------------------------------
     # Search Methods (DFS)
     # ----------------------------------------------------------------------
-    def findAllWords(self):
+    def findAllWords(self, starts=None):
         """
         Iterates over every cell in the grid to start a Depth First Search
         (DFS).
+
+        :param starts: Optional iterable of start cells, numbered row-major
+            (row * cols + col). Defaults to every cell. Used to split one
+            board's search across workers.
         """
         # Ensure visited state is clean before starting
         self.visited = [[False for _ in range(self.cols)]
                         for _ in range(self.rows)]
+        if starts is None:
+            starts = range(self.rows * self.cols)
+
+        if self._instrumentation is None:
+            self._run_core(starts)
+            return
 
-        for row in range(self.rows):
-            for col in range(self.cols):
+        counters, callback, profile_path = self._instrumentation
+        profiler = cProfile.Profile() if profile_path else None
+        if profiler is not None:
+            profiler.enable()
+        try:
+            if counters:
+                self._search_instrumented(starts, callback)
+            else:
+                self._run_core(starts)
+        finally:
+            if profiler is not None:
+                profiler.disable()
+                profiler.dump_stats(profile_path)
+
+    def _run_core(self, starts):
+        """
+        Runs the configured search core from the given start cells.
+        """
+        if self.core == "iterative":
+            if not self.dictionary.walkable:
+                raise ValueError("The iterative core needs a walkable "
+                                 "dictionary engine")
+            self._search_iterative(starts)
+        elif self.dictionary.walkable:
+            root = self.dictionary.ROOT
+            for start in starts:
+                row, col = divmod(start, self.cols)
+                self._dfs_node(row, col, root, [], 0)
+        else:
+            for start in starts:
+                row, col = divmod(start, self.cols)
                 self.dfs(row, col, "")
 
     def dfs(self, row, col, path):
@@ -179,6 +279,493 @@ class Boggle:
         # inherent to DFS backtracking)
         self.visited[row][col] = False
 
+    def _dfs_node(self, row, col, node, path, length):
+        """
+        DFS for walkable engines. Instead of building a new path string and
+        looking it up, it follows one trie edge per tile and only joins the
+        tiles into a string when a word is found.
+
+        :param row: Current row index.
+        :param col: Current column index.
+        :param node: Trie node reached by the tiles in ``path``.
+        :param path: List of tiles on the current path (shared, mutated).
+        :param length: Number of letters in ``path``.
+        """
+        if (row < 0 or col < 0 or row >= self.rows or
+                col >= self.cols or self.visited[row][col]):
+            return
+
+        letter = self.grid[row][col]
+        node = self.dictionary.child(node, letter)
+        if node < 0:
+            return  # No word continues with this tile
+
+        self.visited[row][col] = True
+        path.append(letter)
+        length += len(letter)
+
+        if self.dictionary.is_word(node) and length >= self.min_len:
+            self.solution.add("".join(path))
+
+        for drow in (-1, 0, 1):
+            for dcol in (-1, 0, 1):
+                if drow == 0 and dcol == 0:
+                    continue
+                if not self.allow_diagonals and drow != 0 and dcol != 0:
+                    continue
+                self._dfs_node(row + drow, col + dcol, node, path, length)
+
+        path.pop()
+        self.visited[row][col] = False
+
+    def _search_iterative(self, starts):
+        """
+        Runs the iterative core to completion, filling self.solution.
+        """
+        for _ in self._iter_search(starts):
+            pass
+
+    def _iter_search(self, starts, deadline=None):
+        """
+        Iterative search core. Each start cell runs a DFS on an explicit
+        stack of (cell, trie node, depth, letters so far, visited bitmask)
+        entries. Moves come from the adjacency table, so off-board cells are
+        never tried, and a child is only pushed if the trie has an edge for
+        its tile. Tiles are written into a shared path list by depth and
+        only joined into a string when a word is found.
+
+        This is a generator: each word is added to self.solution and
+        yielded the first time it is found. It sets self.complete to True
+        once every start cell has been searched.
+
+        :param starts: The start cells to search from.
+        :param deadline: Optional time.perf_counter() value. The search
+            stops (with self.complete False) once it is passed; the clock is
+            read every DEADLINE_CHECK_INTERVAL steps.
+        """
+        self.complete = False
+        adjacency = self._get_adjacency()
+        tiles = self._tiles()
+        single = [len(tile) == 1 for tile in tiles]
+        path = [""] * len(tiles)
+
+        engine = self.dictionary
+        first = engine.first
+        labels = engine.labels
+        targets = engine.targets
+        terminal = engine.terminal
+        child = engine.child
+        min_len = self.min_len
+        solution = self.solution
+
+        steps = 0
+
+        for start in starts:
+            tile = tiles[start]
+            node = child(engine.ROOT, tile)
+            if node < 0:
+                continue
+            stack = [(start, node, 0, len(tile), 1 << start)]
+            pop = stack.pop
+            push = stack.append
+
+            while stack:
+                if deadline is not None:
+                    steps += 1
+                    if (steps % DEADLINE_CHECK_INTERVAL == 0 and
+                            time.perf_counter() > deadline):
+                        return
+                cell, node, depth, length, visited = pop()
+                path[depth] = tiles[cell]
+                if terminal[node] and length >= min_len:
+                    word = "".join(path[:depth + 1])
+                    if word not in solution:
+                        solution.add(word)
+                        yield word
+
+                low = first[node]
+                high = first[node + 1]
+                if low == high:
+                    continue  # Leaf: no word continues from here
+                depth += 1
+                for nxt in adjacency[cell]:
+                    if visited >> nxt & 1:
+                        continue
+                    tile = tiles[nxt]
+                    if single[nxt]:
+                        edge = labels.find(tile, low, high)
+                        if edge < 0:
+                            continue
+                        next_node = targets[edge]
+                    else:
+                        next_node = child(node, tile)
+                        if next_node < 0:
+                            continue
+                    push((nxt, next_node, depth, length + len(tile),
+                          visited | 1 << nxt))
+        self.complete = True
+
+    # ----------------------------------------------------------------------
+    # Instrumentation
+    # ----------------------------------------------------------------------
+    def enable_stats(self, counters=True, callback=None, profile_path=None):
+        """
+        Turns on instrumentation for the following solves.
+
+        With ``counters``, the board is searched by an instrumented DFS that
+        fills a SearchStats object (see boggle_stats.py), available as
+        self.stats after getSolution(). It finds the same words as the
+        normal cores, only more slowly.
+
+        :param counters: Collect SearchStats counters.
+        :param callback: Called as callback(row, col, seconds, stats) after
+            each start cell of an instrumented search.
+        :param profile_path: If set, every solve runs under cProfile and the
+            profile is written to this file (readable with pstats, or turned
+            into a flamegraph by tools such as flameprof or snakeviz).
+        """
+        self._instrumentation = (counters, callback, profile_path)
+
+    def disable_stats(self):
+        """
+        Turns instrumentation off; solves run the plain search cores again.
+        """
+        self._instrumentation = None
+
+    def _search_instrumented(self, starts, callback=None):
+        """
+        Instrumented DFS, visiting the same cells as the recursive core.
+        Works with any engine: for walkable ones the search state is a trie
+        node, otherwise it is the prefix string itself.
+        """
+        stats = self.stats = SearchStats()
+        engine = self.dictionary
+        if engine.walkable:
+            root = engine.ROOT
+
+            def step(node, tile):
+                node = engine.child(node, tile)
+                return node if node >= 0 else None
+
+            def is_word(node):
+                return engine.terminal[node] == 1
+        else:
+            root = ""
+
+            def step(prefix, tile):
+                prefix += tile
+                return prefix if engine.has_prefix(prefix) else None
+
+            def is_word(prefix):
+                return prefix in engine
+
+        for start in starts:
+            row, col = divmod(start, self.cols)
+            began = time.perf_counter()
+            self._dfs_instrumented(row, col, root, [], 0, stats, step,
+                                   is_word)
+            elapsed = time.perf_counter() - began
+            stats.start_seconds[(row, col)] = elapsed
+            if callback is not None:
+                callback(row, col, elapsed, stats)
+        stats.words_found = len(self.solution)
+
+    def _dfs_instrumented(self, row, col, node, path, length, stats, step,
+                          is_word):
+        """
+        One step of the instrumented DFS; mirrors _dfs_node.
+        """
+        if row < 0 or col < 0 or row >= self.rows or col >= self.cols:
+            stats.out_of_bounds += 1
+            return
+        if self.visited[row][col]:
+            stats.visited_rejections += 1
+            return
+
+        letter = self.grid[row][col]
+        node = step(node, letter)
+        if node is None:
+            stats.prefix_pruned += 1
+            return
+
+        stats.nodes_expanded += 1
+        self.visited[row][col] = True
+        path.append(letter)
+        length += len(letter)
+        if len(path) > stats.max_depth:
+            stats.max_depth = len(path)
+
+        if is_word(node) and length >= self.min_len:
+            self.solution.add("".join(path))
+
+        for drow in (-1, 0, 1):
+            for dcol in (-1, 0, 1):
+                if drow == 0 and dcol == 0:
+                    continue
+                if not self.allow_diagonals and drow != 0 and dcol != 0:
+                    continue
+                self._dfs_instrumented(row + drow, col + dcol, node, path,
+                                       length, stats, step, is_word)
+
+        path.pop()
+        self.visited[row][col] = False
+
+    # ----------------------------------------------------------------------
+    # Streaming
+    # ----------------------------------------------------------------------
+    def iter_words(self, limit=None, time_budget=None):
+        """
+        Yields each unique word as soon as the search first finds it,
+        instead of waiting for the whole board like getSolution(). Words
+        come in discovery order, not sorted. Needs a walkable engine.
+
+        The search can be cut short: after ``limit`` words, after
+        ``time_budget`` seconds, or simply by not consuming the generator
+        any further. Afterwards self.complete tells whether the board was
+        searched in full, and self.solution holds every word yielded.
+
+        :param limit: Stop after this many words.
+        :param time_budget: Stop once this many seconds have passed.
+        """
+        if not self.dictionary.walkable:
+            raise ValueError("Streaming needs a walkable dictionary engine")
+        self.solution.clear()
+        self._solved = False
+        self.complete = False
+        if limit is not None and limit <= 0:
+            return
+        deadline = (None if time_budget is None
+                    else time.perf_counter() + time_budget)
+
+        count = 0
+        starts = range(self.rows * self.cols)
+        for word in self._iter_search(starts, deadline):
+            yield word
+            count += 1
+            if count == limit:
+                return
+        self._solved = self.complete
+
+    # ----------------------------------------------------------------------
+    # Word Paths
+    # ----------------------------------------------------------------------
+    def get_paths(self, max_paths=1):
+        """
+        Solves the board and returns the cell paths of every word, so a UI
+        can highlight them without searching again. Needs a walkable
+        engine.
+
+        Paths are packed: each word maps to one flat ``array`` of cell
+        numbers (row * cols + col) holding its paths one after the other,
+        each preceded by its number of cells. Use unpack_paths() to read
+        them. ``max_paths`` caps how many paths are kept per word, so boards
+        where a word can be traced in thousands of ways stay small.
+
+        :param max_paths: Paths to keep per word; None keeps all of them.
+        :return: A dict of word to packed paths. self.solution is filled as
+            by getSolution().
+        """
+        if not self.dictionary.walkable:
+            raise ValueError("Paths need a walkable dictionary engine")
+        adjacency = self._get_adjacency()
+        tiles = self._tiles()
+        typecode = "H" if len(tiles) <= 0xFFFF else "I"
+        path = [""] * len(tiles)
+        cells = [0] * len(tiles)
+        paths = {}
+        counts = {}
+
+        engine = self.dictionary
+        child = engine.child
+        terminal = engine.terminal
+        min_len = self.min_len
+
+        for start, tile in enumerate(tiles):
+            node = child(engine.ROOT, tile)
+            if node < 0:
+                continue
+            stack = [(start, node, 0, len(tile), 1 << start)]
+            while stack:
+                cell, node, depth, length, visited = stack.pop()
+                path[depth] = tiles[cell]
+                cells[depth] = cell
+                if terminal[node] and length >= min_len:
+                    word = "".join(path[:depth + 1])
+                    count = counts.get(word, 0)
+                    if max_paths is None or count < max_paths:
+                        packed = paths.get(word)
+                        if packed is None:
+                            packed = paths[word] = array(typecode)
+                        packed.append(depth + 1)
+                        packed.extend(cells[:depth + 1])
+                        counts[word] = count + 1
+                depth += 1
+                for nxt in adjacency[cell]:
+                    if visited >> nxt & 1:
+                        continue
+                    tile = tiles[nxt]
+                    next_node = child(node, tile)
+                    if next_node >= 0:
+                        stack.append((nxt, next_node, depth,
+                                      length + len(tile), visited | 1 << nxt))
+
+        self.solution = set(paths)
+        self._solved = self.complete = True
+        return paths
+
+    def unpack_paths(self, packed):
+        """
+        Decodes one word's packed paths from get_paths().
+
+        :return: A list of paths, each a list of (row, col) tuples.
+        """
+        paths = []
+        i = 0
+        while i < len(packed):
+            size = packed[i]
+            paths.append([divmod(cell, self.cols)
+                          for cell in packed[i + 1:i + 1 + size]])
+            i += 1 + size
+        return paths
+
+    # ----------------------------------------------------------------------
+    # Incremental Updates
+    # ----------------------------------------------------------------------
+    def update_cell(self, row, col, value):
+        """
+        Changes one cell and updates the solution without a full re-solve.
+
+        The first call runs a tracked solve that records, for every start
+        cell, the words its DFS found and the cells it looked at. A later
+        edit can only change the result of start cells whose DFS looked at
+        the edited cell, so only those are searched again. Non-walkable
+        engines fall back to a full solve.
+
+        :param row: Row of the changed cell.
+        :param col: Column of the changed cell.
+        :param value: The new tile (for example "E" or "Qu").
+        :return: A pair of sorted lists (added words, removed words).
+        """
+        if not (0 <= row < self.rows and 0 <= col < self.cols):
+            raise IndexError("Cell (%d, %d) is outside the grid"
+                             % (row, col))
+        old_solution = set(self.solution) if self._solved else set()
+
+        if not self.dictionary.walkable:
+            self.grid[row][col] = value.upper()
+            new_solution = set(self.getSolution())
+            return (sorted(new_solution - old_solution),
+                    sorted(old_solution - new_solution))
+
+        if not self._solved or self._tracking is None:
+            self._solve_tracked()
+            old_solution = set(self.solution)
+
+        self.grid[row][col] = value.upper()
+        cell = row * self.cols + col
+        start_words, start_seen, counts = self._tracking
+        tiles = self._tiles()
+        changed = set()
+        for start, seen in enumerate(start_seen):
+            if not seen >> cell & 1:
+                continue
+            for word in start_words[start]:
+                counts[word] -= 1
+            words, start_seen[start] = self._search_start(start, tiles)
+            for word in words:
+                counts[word] = counts.get(word, 0) + 1
+            changed.update(start_words[start])
+            changed.update(words)
+            start_words[start] = words
+
+        added = []
+        removed = []
+        for word in changed:
+            if counts[word] > 0 and word not in old_solution:
+                added.append(word)
+            elif counts[word] == 0:
+                del counts[word]
+                if word in old_solution:
+                    removed.append(word)
+        self.solution = set(counts)
+        self._solved = True
+        return sorted(added), sorted(removed)
+
+    def _solve_tracked(self):
+        """
+        Solves the board one start cell at a time, keeping what update_cell
+        needs: the words and the looked-at cells of each start, and for
+        every word the number of start cells that found it.
+        """
+        start_words = []
+        start_seen = []
+        counts = {}
+        tiles = self._tiles()
+        for start in range(len(tiles)):
+            words, seen = self._search_start(start, tiles)
+            start_words.append(words)
+            start_seen.append(seen)
+            for word in words:
+                counts[word] = counts.get(word, 0) + 1
+        self._tracking = (start_words, start_seen, counts)
+        self.solution = set(counts)
+        self._solved = True
+
+    def _search_start(self, start, tiles):
+        """
+        Runs the iterative DFS from one start cell.
+
+        :param start: The start cell (row-major number).
+        :param tiles: The board's tiles in row-major order.
+
+        :return: The set of words found, and a bitmask of every cell whose
+            tile the search looked at (the start cell plus all neighbors of
+            the cells it expanded).
+        """
+        adjacency = self._get_adjacency()
+        path = [""] * len(tiles)
+        words = set()
+        seen = 1 << start
+
+        engine = self.dictionary
+        first = engine.first
+        labels = engine.labels
+        targets = engine.targets
+        terminal = engine.terminal
+        child = engine.child
+        min_len = self.min_len
+
+        node = child(engine.ROOT, tiles[start])
+        if node < 0:
+            return words, seen
+        stack = [(start, node, 0, len(tiles[start]), 1 << start)]
+        while stack:
+            cell, node, depth, length, visited = stack.pop()
+            path[depth] = tiles[cell]
+            if terminal[node] and length >= min_len:
+                words.add("".join(path[:depth + 1]))
+            low = first[node]
+            high = first[node + 1]
+            if low == high:
+                continue  # Leaf: the neighbors are never looked at
+            depth += 1
+            for nxt in adjacency[cell]:
+                seen |= 1 << nxt
+                if visited >> nxt & 1:
+                    continue
+                tile = tiles[nxt]
+                if len(tile) == 1:
+                    edge = labels.find(tile, low, high)
+                    if edge < 0:
+                        continue
+                    next_node = targets[edge]
+                else:
+                    next_node = child(node, tile)
+                    if next_node < 0:
+                        continue
+                stack.append((nxt, next_node, depth, length + len(tile),
+                              visited | 1 << nxt))
+        return words, seen
 
 def main():
     # --- Demo Setup ---
@@ -0,0 +1,70 @@
+"""
+Search statistics for the Boggle solver.
+
+Instrumentation is opt-in (see Boggle.enable_stats). When it is off, the
+solver runs its normal search cores, which contain no counters at all; the
+only cost is one attribute check per solve. When it is on, the board is
+searched by an instrumented DFS that visits exactly the same cells as the
+recursive core and records, in a SearchStats object:
+
+- nodes_expanded: cells added to a path (their prefix was valid)
+- prefix_pruned: cells rejected because no word continues with their tile
+- out_of_bounds: moves that left the board
+- visited_rejections: moves onto a cell already on the path
+- max_depth: the longest path, in cells
+- start_seconds: the search time spent from each start cell
+"""
+
+
+class SearchStats:
+    """
+    Counters collected by one instrumented solve.
+    """
+
+    def __init__(self):
+        self.nodes_expanded = 0
+        self.prefix_pruned = 0
+        self.out_of_bounds = 0
+        self.visited_rejections = 0
+        self.max_depth = 0
+        self.words_found = 0
+        self.start_seconds = {}  # (row, col) -> seconds
+
+    @property
+    def nodes_visited(self):
+        """
+        Every DFS step, accepted or rejected.
+        """
+        return (self.nodes_expanded + self.prefix_pruned +
+                self.out_of_bounds + self.visited_rejections)
+
+    @property
+    def total_seconds(self):
+        return sum(self.start_seconds.values())
+
+    def slowest_starts(self, count=5):
+        """
+        Returns the ``count`` most expensive start cells as
+        ((row, col), seconds) pairs, slowest first.
+        """
+        return sorted(self.start_seconds.items(), key=lambda item: item[1],
+                      reverse=True)[:count]
+
+    def as_dict(self):
+        """
+        Returns the counters as a plain dict (for logging or JSON).
+        """
+        return {
+            "nodes_visited": self.nodes_visited,
+            "nodes_expanded": self.nodes_expanded,
+            "prefix_pruned": self.prefix_pruned,
+            "out_of_bounds": self.out_of_bounds,
+            "visited_rejections": self.visited_rejections,
+            "max_depth": self.max_depth,
+            "words_found": self.words_found,
+            "total_seconds": self.total_seconds,
+        }
+
+    def __repr__(self):
+        return "SearchStats(%s)" % ", ".join(
+            "%s=%r" % item for item in self.as_dict().items())
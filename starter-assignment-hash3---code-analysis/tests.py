@@ -1,6 +1,23 @@
+import asyncio
+import json
+import os
+import random
+import tempfile
 import unittest
 import sys
 
+import boggle_benchmark
+from boggle_batch import BoggleBatchSolver
+from boggle_cache import SolutionCache, canonical_grid
+from boggle_dice import dice_faces, dice_grid
+from boggle_dictionary import SetDictionary, TrieDictionary
+from boggle_export import export_solutions, iter_read
+from boggle_generator import (BoardTarget, generate_board, generate_boards,
+                              write_endpoint_json)
+from boggle_index import (FORMAT_VERSION, StaleIndexError, build_index,
+                          file_checksum, load_dictionary, open_index)
+from boggle_parallel import solve_parallel, start_chunks
+from boggle_service import BoggleService, LocalClient, percentile, serve
 from boggle_solver import Boggle
 
 sys.path.append("/home/codio/workspace/")  # Must set PATH for Boggle Class
@@ -62,5 +79,657 @@ class TestSuite_Qu_and_St(unittest.TestCase):
         self.assertEqual(True, True)
 
 
+class TestSuite_Dictionary_Engines(unittest.TestCase):
+
+    GRID = [["T", "W", "Y", "R"], ["E", "N", "P", "H"],
+            ["G", "Z", "Qu", "R"], ["O", "N", "T", "A"]]
+    DICTIONARY = ["art", "ego", "gent", "get", "net", "new", "newt", "prat",
+                  "pry", "qua", "quart", "quartz", "rat", "tar", "tarp",
+                  "ten", "went", "wet", "arty", "rhr", "not", "quar",
+                  "   TAR "]
+
+    def test_trie_and_set_engines_agree(self):
+        for min_len in (1, 3, 4):
+            for allow_diagonals in (True, False):
+                trie_game = Boggle(self.GRID, self.DICTIONARY, min_len,
+                                   allow_diagonals, engine="trie")
+                set_game = Boggle(self.GRID, self.DICTIONARY, min_len,
+                                  allow_diagonals, engine="set")
+                self.assertEqual(set_game.getSolution(),
+                                 trie_game.getSolution())
+
+    def test_default_engine_is_walkable_trie(self):
+        mygame = Boggle(self.GRID, self.DICTIONARY)
+        self.assertIsInstance(mygame.dictionary, TrieDictionary)
+        self.assertEqual(["ART", "EGO", "GENT", "GET", "NET", "NEW", "NEWT",
+                          "PRAT", "PRY", "QUA", "QUAR", "QUART", "QUARTZ",
+                          "RAT", "RHR", "TAR", "TARP", "TEN", "WENT", "WET"],
+                         mygame.getSolution())
+
+    def test_trie_membership_and_prefixes(self):
+        trie = TrieDictionary(self.DICTIONARY)
+        reference = SetDictionary(self.DICTIONARY)
+        self.assertEqual(len(reference), len(trie))
+        self.assertEqual(list(reference), list(trie))
+        for word in ("TAR", "TARP", "QUARTZ", "TA", "QUARTZY", "X"):
+            self.assertEqual(word in reference, word in trie)
+            self.assertEqual(reference.has_prefix(word),
+                             trie.has_prefix(word))
+
+    def test_dawg_shares_suffixes(self):
+        trie = TrieDictionary(["walking", "talking", "balking"])
+        # "ALKING" is stored once: root, 3 first letters collapse into one
+        # node, then the shared 6-letter suffix
+        self.assertEqual(8, trie.node_count)
+        self.assertIn("TALKING", trie)
+        self.assertNotIn("ALKING", trie)
+
+    def test_prebuilt_engine_is_shared(self):
+        trie = TrieDictionary(self.DICTIONARY)
+        mygame = Boggle(self.GRID, trie)
+        self.assertIs(trie, mygame.dictionary)
+
+
+class TestSuite_Mapped_Index(unittest.TestCase):
+
+    GRID = TestSuite_Dictionary_Engines.GRID
+    DICTIONARY = TestSuite_Dictionary_Engines.DICTIONARY
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.source = os.path.join(self.directory.name, "words.txt")
+        self.write_words(self.DICTIONARY)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def write_words(self, words):
+        with open(self.source, "w", encoding="utf-8") as out:
+            out.write("\n".join(words) + "\n")
+
+    def test_mapped_engine_matches_in_memory_engine(self):
+        mapped = load_dictionary(self.source)
+        self.assertTrue(os.path.exists(self.source + ".idx"))
+        self.assertEqual(list(TrieDictionary(self.DICTIONARY)), list(mapped))
+        self.assertEqual(Boggle(self.GRID, self.DICTIONARY).getSolution(),
+                         Boggle(self.GRID, mapped).getSolution())
+
+    def test_index_rebuilt_when_word_list_changes(self):
+        self.assertNotIn("TWEN", load_dictionary(self.source))
+        self.write_words(self.DICTIONARY + ["twen"])
+        with self.assertRaises(StaleIndexError):
+            open_index(self.source + ".idx", file_checksum(self.source))
+        self.assertIn("TWEN", load_dictionary(self.source))
+
+    def test_index_rebuilt_on_version_mismatch(self):
+        index_path = build_index(self.source)
+        with open(index_path, "r+b") as index:
+            index.seek(8)
+            index.write((FORMAT_VERSION + 1).to_bytes(4, "little"))
+        with self.assertRaises(StaleIndexError):
+            open_index(index_path)
+        self.assertIn("QUARTZ", load_dictionary(self.source))
+
+
+RANDOM_TILES = ["A", "E", "I", "N", "R", "S", "T", "Qu", "St", "Ie"]
+
+
+def random_grid(rng, size):
+    return [rng.choices(RANDOM_TILES, k=size) for _ in range(size)]
+
+
+def random_dictionary(rng, count=3000):
+    return ["".join(rng.choices("AEINRSTQU", k=rng.randint(1, 7)))
+            for _ in range(count)]
+
+
+class TestSuite_Search_Cores(unittest.TestCase):
+
+    def test_iterative_core_matches_recursive_core(self):
+        rng = random.Random(7)
+        for size in (1, 2, 3, 4, 6, 9):
+            grid = random_grid(rng, size)
+            engine = TrieDictionary(random_dictionary(rng))
+            for min_len in (1, 3):
+                for allow_diagonals in (True, False):
+                    recursive = Boggle(grid, engine, min_len, allow_diagonals,
+                                       core="recursive")
+                    iterative = Boggle(grid, engine, min_len, allow_diagonals,
+                                       core="iterative")
+                    self.assertEqual(recursive.getSolution(),
+                                     iterative.getSolution())
+
+    def test_iterative_core_edge_grids(self):
+        for grid in ([], [[]], [["A"]], [["A", "B"], ["C"]]):
+            mygame = Boggle(grid, ["a", "abc", "ac"], min_len=1,
+                            core="iterative")
+            reference = Boggle(grid, ["a", "abc", "ac"], min_len=1,
+                               engine="set")
+            self.assertEqual(reference.getSolution(), mygame.getSolution())
+
+    def test_adjacency_follows_diagonal_rule(self):
+        mygame = Boggle([["A", "B"], ["C", "D"]], [], core="iterative")
+        self.assertEqual((1, 2, 3), mygame._get_adjacency()[0])
+        mygame.allow_diagonals = False
+        self.assertEqual((1, 2), mygame._get_adjacency()[0])
+
+    def test_invalid_core_combinations(self):
+        with self.assertRaises(ValueError):
+            Boggle([["A"]], [], core="threaded")
+        mygame = Boggle([["A"]], ["a"], engine="set", core="iterative")
+        with self.assertRaises(ValueError):
+            mygame.getSolution()
+
+
+class TestSuite_Batch_Solver(unittest.TestCase):
+
+    def setUp(self):
+        rng = random.Random(11)
+        self.engine = TrieDictionary(random_dictionary(rng))
+        self.grids = [random_grid(rng, 4) for _ in range(40)]
+
+    def expected(self, grids):
+        return {grid_id: Boggle(grid, self.engine).getSolution()
+                for grid_id, grid in grids.items()}
+
+    def test_in_process_batch(self):
+        solver = BoggleBatchSolver(self.engine, workers=1)
+        results = dict(solver.solve_many(self.grids))
+        self.assertEqual(self.expected(dict(enumerate(self.grids))), results)
+
+    def test_process_pool_batch_keeps_grid_ids(self):
+        grids = {"board-%d" % i: grid for i, grid in enumerate(self.grids)}
+        solver = BoggleBatchSolver(self.engine, workers=2, chunk_size=3)
+        results = dict(solver.solve_many(grids))
+        self.assertEqual(self.expected(grids), results)
+
+    def test_process_pool_with_mapped_index(self):
+        with tempfile.TemporaryDirectory() as directory:
+            source = os.path.join(directory, "words.txt")
+            with open(source, "w", encoding="utf-8") as out:
+                out.write("\n".join(self.engine))
+            solver = BoggleBatchSolver(load_dictionary(source), workers=2)
+            results = dict(solver.solve_many(self.grids[:5]))
+        self.assertEqual(self.expected(dict(enumerate(self.grids[:5]))),
+                         results)
+
+
+class TestSuite_Parallel_Board(unittest.TestCase):
+
+    def test_start_chunks_cover_every_cell_once(self):
+        chunks = start_chunks(10, 4)
+        self.assertEqual(4, len(chunks))
+        self.assertEqual(list(range(10)),
+                         sorted(cell for chunk in chunks for cell in chunk))
+        self.assertEqual(3, len(start_chunks(3, 16)))
+
+    def test_parallel_matches_serial(self):
+        rng = random.Random(5)
+        grid = random_grid(rng, 12)
+        engine = TrieDictionary(random_dictionary(rng))
+        for core in Boggle.CORES:
+            for allow_diagonals in (True, False):
+                mygame = Boggle(grid, engine, allow_diagonals=allow_diagonals,
+                                core=core)
+                expected = mygame.getSolution()
+                self.assertEqual(expected, solve_parallel(mygame, workers=2))
+                self.assertEqual(set(expected), mygame.solution)
+
+    def test_parallel_with_set_engine_and_tiny_boards(self):
+        rng = random.Random(6)
+        dictionary = random_dictionary(rng)
+        for grid in ([], [["A"]], random_grid(rng, 5)):
+            mygame = Boggle(grid, dictionary, engine="set")
+            self.assertEqual(mygame.getSolution(),
+                             solve_parallel(mygame, workers=3))
+
+
+class TestSuite_Incremental_Updates(unittest.TestCase):
+
+    def test_update_cell_matches_full_solve(self):
+        rng = random.Random(9)
+        engine = TrieDictionary(random_dictionary(rng))
+        for size, allow_diagonals in ((3, True), (6, True), (7, False)):
+            mygame = Boggle(random_grid(rng, size), engine,
+                            allow_diagonals=allow_diagonals, core="iterative")
+            mygame.getSolution()
+            for _ in range(15):
+                before = set(mygame.solution)
+                row, col = rng.randrange(size), rng.randrange(size)
+                added, removed = mygame.update_cell(
+                    row, col, rng.choice(RANDOM_TILES))
+                expected = set(Boggle(mygame.grid, engine,
+                                      allow_diagonals=allow_diagonals)
+                               .getSolution())
+                self.assertEqual(expected, mygame.solution)
+                self.assertEqual(sorted(expected - before), added)
+                self.assertEqual(sorted(before - expected), removed)
+
+    def test_update_cell_diff(self):
+        mygame = Boggle([["C", "A"], ["X", "T"]], ["cat", "bat", "act"])
+        self.assertEqual(["ACT", "CAT"], mygame.getSolution())
+        self.assertEqual((["BAT"], ["ACT", "CAT"]),
+                         mygame.update_cell(0, 0, "b"))
+        self.assertEqual(([], []), mygame.update_cell(1, 0, "z"))
+        self.assertEqual(["BAT"], mygame.getSolution())
+
+    def test_update_cell_with_set_engine_and_bad_cell(self):
+        mygame = Boggle([["C", "A"], ["X", "T"]], ["cat", "bat"],
+                        engine="set")
+        self.assertEqual((["CAT"], []), mygame.update_cell(1, 0, "y"))
+        self.assertEqual((["BAT"], ["CAT"]), mygame.update_cell(0, 0, "b"))
+        with self.assertRaises(IndexError):
+            mygame.update_cell(2, 0, "a")
+
+
+class TestSuite_Streaming(unittest.TestCase):
+
+    def setUp(self):
+        rng = random.Random(13)
+        self.grid = random_grid(rng, 6)
+        self.engine = TrieDictionary(random_dictionary(rng))
+
+    def test_iter_words_yields_each_word_once(self):
+        mygame = Boggle(self.grid, self.engine)
+        words = list(mygame.iter_words())
+        self.assertEqual(len(set(words)), len(words))
+        self.assertEqual(mygame.getSolution(), sorted(words))
+        self.assertTrue(mygame.complete)
+
+    def test_iter_words_limit(self):
+        mygame = Boggle(self.grid, self.engine)
+        expected = mygame.getSolution()
+        words = list(mygame.iter_words(limit=5))
+        self.assertEqual(5, len(words))
+        self.assertTrue(set(words) <= set(expected))
+        self.assertEqual(set(words), mygame.solution)
+        self.assertFalse(mygame.complete)
+        self.assertEqual([], list(mygame.iter_words(limit=0)))
+
+    def test_iter_words_time_budget(self):
+        mygame = Boggle(random_grid(random.Random(1), 30), self.engine)
+        words = list(mygame.iter_words(time_budget=0))
+        self.assertFalse(mygame.complete)
+        self.assertEqual(set(words), mygame.solution)
+
+    def test_iter_words_needs_walkable_engine(self):
+        mygame = Boggle(self.grid, ["ant"], engine="set")
+        with self.assertRaises(ValueError):
+            next(mygame.iter_words())
+
+
+class TestSuite_Solution_Cache(unittest.TestCase):
+
+    GRID = TestSuite_Dictionary_Engines.GRID
+    DICTIONARY = TestSuite_Dictionary_Engines.DICTIONARY
+
+    def symmetries(self, grid):
+        rotated = [list(row) for row in zip(*grid[::-1])]
+        return [grid, rotated, [row[::-1] for row in grid], grid[::-1],
+                [list(row) for row in zip(*grid)]]
+
+    def test_symmetric_boards_share_one_entry(self):
+        cache = SolutionCache()
+        engine = TrieDictionary(self.DICTIONARY)
+        for grid in self.symmetries(self.GRID):
+            mygame = Boggle(grid, engine)
+            self.assertEqual(Boggle(grid, engine).getSolution(),
+                             cache.get_solution(mygame))
+        self.assertEqual(1, len(cache))
+        self.assertEqual(1, cache.misses)
+        self.assertEqual(4, cache.hits)
+        self.assertEqual(canonical_grid([["B", "A"]]),
+                         canonical_grid([["A"], ["B"]]))
+
+    def test_rules_and_dictionary_are_part_of_the_key(self):
+        cache = SolutionCache()
+        cache.get_solution(Boggle(self.GRID, self.DICTIONARY))
+        cache.get_solution(Boggle(self.GRID, self.DICTIONARY, min_len=4))
+        cache.get_solution(Boggle(self.GRID, self.DICTIONARY,
+                                  allow_diagonals=False))
+        cache.get_solution(Boggle(self.GRID, ["ten"]))
+        self.assertEqual(4, cache.misses)
+        # Same words, other engine: same fingerprint
+        cache.get_solution(Boggle(self.GRID, self.DICTIONARY, engine="set"))
+        self.assertEqual(1, cache.hits)
+
+    def test_lru_eviction(self):
+        cache = SolutionCache(maxsize=2)
+        engine = TrieDictionary(self.DICTIONARY)
+        boards = [[["A", "R", "T"]], [["T", "E", "N"]], [["W", "E", "T"]]]
+        for grid in boards[:2]:
+            cache.get_solution(Boggle(grid, engine))
+        cache.get_solution(Boggle(boards[0], engine))  # Refresh first board
+        cache.get_solution(Boggle(boards[2], engine))  # Evicts the second
+        self.assertEqual({"hits": 1, "misses": 3, "evictions": 1,
+                          "size": 2, "maxsize": 2}, cache.stats())
+        cache.get_solution(Boggle(boards[0], engine))
+        self.assertEqual(2, cache.hits)
+
+    def test_disk_persistence(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "cache.json")
+            cache = SolutionCache(path=path)
+            expected = cache.get_solution(Boggle(self.GRID, self.DICTIONARY))
+            cache.save()
+            reloaded = SolutionCache(path=path)
+            self.assertEqual(expected, reloaded.get_solution(
+                Boggle(self.GRID[::-1], self.DICTIONARY)))
+            self.assertEqual(1, reloaded.hits)
+
+
+class TestSuite_Word_Paths(unittest.TestCase):
+
+    GRID = TestSuite_Dictionary_Engines.GRID
+    DICTIONARY = TestSuite_Dictionary_Engines.DICTIONARY
+
+    def assertValidPath(self, mygame, word, path):
+        self.assertEqual(len(path), len(set(path)))
+        self.assertEqual(word, "".join(mygame.grid[r][c] for r, c in path))
+        for (r1, c1), (r2, c2) in zip(path, path[1:]):
+            self.assertLessEqual(max(abs(r1 - r2), abs(c1 - c2)), 1)
+
+    def test_paths_spell_every_word(self):
+        mygame = Boggle(self.GRID, self.DICTIONARY)
+        paths = mygame.get_paths()
+        self.assertEqual(Boggle(self.GRID, self.DICTIONARY).getSolution(),
+                         sorted(paths))
+        self.assertEqual(sorted(paths), sorted(mygame.solution))
+        for word, packed in paths.items():
+            unpacked = mygame.unpack_paths(packed)
+            self.assertEqual(1, len(unpacked))
+            self.assertValidPath(mygame, word, unpacked[0])
+        self.assertEqual([[(2, 2), (3, 3), (2, 3), (3, 2)]],
+                         mygame.unpack_paths(paths["QUART"]))
+
+    def test_all_paths_and_cap(self):
+        mygame = Boggle([["A", "A"], ["A", "A"]], ["aaa"])
+        packed = mygame.get_paths(max_paths=None)["AAA"]
+        self.assertEqual("H", packed.typecode)
+        all_paths = mygame.unpack_paths(packed)
+        self.assertEqual(24, len(all_paths))
+        self.assertEqual(24, len(set(map(tuple, all_paths))))
+        for path in all_paths:
+            self.assertValidPath(mygame, "AAA", path)
+        capped = mygame.unpack_paths(mygame.get_paths(max_paths=5)["AAA"])
+        self.assertEqual(all_paths[:5], capped)
+
+
+class TestSuite_Benchmark_Harness(unittest.TestCase):
+
+    def test_dice_grids_are_seeded(self):
+        grid = dice_grid(5, random.Random(3))
+        self.assertEqual(grid, dice_grid(5, random.Random(3)))
+        faces = set(face for die in dice_faces()
+                    for face in die)
+        self.assertTrue({"Qu", "St", "Ie"} <= faces)
+        self.assertTrue(all(len(row) == 5 and set(row) <= faces
+                            for row in grid))
+
+    def test_synthetic_dictionary_sizes(self):
+        base = sorted(set(random_dictionary(random.Random(1), 200)))
+        sample = boggle_benchmark.synthetic_dictionary(
+            40, random.Random(1), base)
+        self.assertEqual(40, len(set(sample)))
+        grown = boggle_benchmark.synthetic_dictionary(
+            len(base) + 100, random.Random(1), base)
+        self.assertEqual(len(base) + 100, len(set(grown)))
+        self.assertTrue(set(base) <= set(grown))
+
+    def test_node_counts_agree_across_solvers(self):
+        grid = dice_grid(4, random.Random(2))
+        words = random_dictionary(random.Random(2))
+        counts = set()
+        for _, factory in boggle_benchmark.implementations():
+            mygame = factory(words)
+            mygame.setGrid(grid)
+            counts.add(boggle_benchmark.count_nodes(mygame))
+        self.assertEqual(1, len(counts))
+
+    def test_suite_writes_json(self):
+        solvers = boggle_benchmark.implementations()[:2]
+        records = boggle_benchmark.run_suite([3], [50], repeat=1,
+                                             solvers=solvers)
+        self.assertEqual(2, len(records))
+        self.assertEqual(records[0]["words_found"],
+                         records[1]["words_found"])
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "bench.json")
+            boggle_benchmark.write_results(records, path, seed=0)
+            with open(path, encoding="utf-8") as source:
+                report = json.load(source)
+        self.assertEqual(records, report["results"])
+        self.assertEqual(0, report["meta"]["seed"])
+
+
+class TestSuite_Search_Stats(unittest.TestCase):
+
+    GRID = TestSuite_Dictionary_Engines.GRID
+    DICTIONARY = TestSuite_Dictionary_Engines.DICTIONARY
+
+    def test_stats_match_plain_solve(self):
+        expected = Boggle(self.GRID, self.DICTIONARY).getSolution()
+        for engine in ("trie", "set"):
+            mygame = Boggle(self.GRID, self.DICTIONARY, engine=engine,
+                            core="recursive")
+            mygame.enable_stats()
+            self.assertEqual(expected, mygame.getSolution())
+            stats = mygame.stats
+            self.assertEqual(len(expected), stats.words_found)
+            self.assertEqual(16, len(stats.start_seconds))
+            self.assertEqual(5, stats.max_depth)  # QU-A-R-T-Z
+            self.assertGreater(stats.out_of_bounds, 0)
+            self.assertEqual(stats.nodes_visited,
+                             boggle_benchmark.count_nodes(
+                                 Boggle(self.GRID, self.DICTIONARY,
+                                        engine="set")))
+
+    def test_counters_on_tiny_board(self):
+        mygame = Boggle([["A", "B"]], ["ab"], min_len=2)
+        mygame.enable_stats()
+        self.assertEqual(["AB"], mygame.getSolution())
+        # From A: A and B accepted, then A rejected as visited. From B:
+        # pruned at once, since no word starts with B
+        self.assertEqual(2, mygame.stats.nodes_expanded)
+        self.assertEqual(1, mygame.stats.prefix_pruned)
+        self.assertEqual(1, mygame.stats.visited_rejections)
+        self.assertEqual(2, mygame.stats.max_depth)
+
+    def test_callback_and_profile_dump(self):
+        calls = []
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "solve.prof")
+            mygame = Boggle(self.GRID, self.DICTIONARY, core="iterative")
+            mygame.enable_stats(counters=False, profile_path=path)
+            mygame.getSolution()
+            self.assertIsNone(mygame.stats)
+            self.assertGreater(os.path.getsize(path), 0)
+        mygame.enable_stats(callback=lambda *args: calls.append(args[:2]))
+        mygame.getSolution()
+        self.assertEqual(16, len(calls))
+        mygame.disable_stats()
+        mygame.stats = None
+        mygame.getSolution()
+        self.assertIsNone(mygame.stats)
+
+
+class TestSuite_Board_Generator(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        words = boggle_benchmark.load_wordlist()
+        cls.engine = TrieDictionary(random.Random(5).sample(words, 20000))
+
+    def test_target_cost(self):
+        target = BoardTarget(min_words=3, max_words=4, long_word_len=5,
+                             min_long_words=1)
+        self.assertEqual(0, target.cost(["CAT", "DOG", "HORSE"]))
+        self.assertEqual(11, target.cost(["CAT", "DOG"]))
+        self.assertEqual(1, target.cost(["CAT", "DOG", "HORSE", "A", "B"]))
+        self.assertTrue(target.is_met(["CAT", "DOG", "HORSE"]))
+        self.assertEqual(-2, BoardTarget().cost(["CAT", "DOG"]))
+        self.assertFalse(BoardTarget().is_met(["CAT", "DOG"]))
+
+    def test_generated_board_meets_target(self):
+        target = BoardTarget(min_words=60, long_word_len=6, min_long_words=2)
+        grid, words, cost = generate_board(4, self.engine, target,
+                                           random.Random(1))
+        self.assertEqual(0, cost)
+        self.assertEqual(Boggle(grid, self.engine).getSolution(), words)
+        self.assertGreaterEqual(len(words), 60)
+        self.assertGreaterEqual(sum(len(word) >= 6 for word in words), 2)
+
+    def test_maximizing_improves_on_first_board(self):
+        rng = random.Random(4)
+        first = len(Boggle(dice_grid(4, random.Random(4)),
+                           self.engine).getSolution())
+        _, words, cost = generate_board(4, self.engine, BoardTarget(), rng,
+                                        steps=200)
+        self.assertEqual(-len(words), cost)
+        self.assertGreaterEqual(len(words), first)
+
+    def test_boards_are_reproducible_in_workers(self):
+        target = BoardTarget(min_words=30)
+        inline = list(generate_boards(3, 4, self.engine, target, workers=1,
+                                      seed=10, steps=300))
+        pooled = list(generate_boards(3, 4, self.engine, target, workers=2,
+                                      seed=10, steps=300))
+        self.assertEqual(inline, pooled)
+        self.assertEqual([10, 11, 12], [record["seed"] for record in inline])
+
+    def test_endpoint_json_schema(self):
+        record = {"size": 2, "grid": [["QU", "A"], ["ST", "E"]],
+                  "solutions": ["QUA", "SEA"], "cost": 0, "seed": 0}
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "boards.json")
+            write_endpoint_json([record], path)
+            with open(path, encoding="utf-8") as source:
+                boards = json.load(source)
+        self.assertEqual({"0": {"size": 2,
+                                "grid": [["qu", "a"], ["st", "e"]],
+                                "solutions": ["qua", "sea"]}}, boards)
+
+
+class TestSuite_Export(unittest.TestCase):
+
+    def setUp(self):
+        rng = random.Random(13)
+        self.engine = TrieDictionary(random_dictionary(rng))
+        self.grids = [random_grid(rng, 4) for _ in range(25)]
+        self.expected = {
+            grid_id: {"size": 4,
+                      "grid": [[tile.lower() for tile in row] for row in grid],
+                      "solutions": [word.lower() for word in
+                                    Boggle(grid, self.engine).getSolution()]}
+            for grid_id, grid in enumerate(self.grids)}
+
+    def test_endpoint_file_matches_json_dump(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "boards.json")
+            count = export_solutions(iter(self.grids), self.engine, path,
+                                     format="endpoint", workers=1)
+            with open(path, encoding="utf-8") as source:
+                boards = json.load(source)
+        self.assertEqual(25, count)
+        self.assertEqual({str(grid_id): record for grid_id, record
+                          in self.expected.items()}, boards)
+
+    def test_json_lines_from_worker_pool(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "boards.jsonl")
+            export_solutions(self.grids, self.engine, path, workers=2,
+                             chunk_size=4)
+            self.assertEqual(self.expected, dict(iter_read(path)))
+
+    def test_sharded_output_and_index(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "shards")
+            export_solutions(self.grids, self.engine, path, shard_size=10,
+                             workers=1)
+            with open(os.path.join(path, "index.json"),
+                      encoding="utf-8") as source:
+                index = json.load(source)
+            self.assertEqual(25, index["count"])
+            self.assertEqual([10, 10, 5], [shard["count"]
+                                           for shard in index["shards"]])
+            self.assertEqual((0, 24), (index["shards"][0]["first_id"],
+                                       index["shards"][-1]["last_id"]))
+            self.assertEqual(self.expected, dict(iter_read(path)))
+
+    def test_unknown_format(self):
+        with self.assertRaises(ValueError):
+            export_solutions([], self.engine, "unused", format="xml")
+
+
+class TestSuite_Solver_Service(unittest.IsolatedAsyncioTestCase):
+
+    GRID = TestSuite_Dictionary_Engines.GRID
+    DICTIONARY = TestSuite_Dictionary_Engines.DICTIONARY
+
+    async def asyncSetUp(self):
+        self.service = BoggleService(self.DICTIONARY, workers=1,
+                                     max_pending=2)
+        await self.service.start()
+        self.client = LocalClient(self.service)
+
+    async def asyncTearDown(self):
+        await self.service.close()
+
+    async def test_solve_returns_endpoint_record(self):
+        status, record = await self.client.solve(self.GRID)
+        self.assertEqual(200, status)
+        self.assertEqual(4, record["size"])
+        self.assertEqual([word.lower() for word in
+                          Boggle(self.GRID, self.DICTIONARY).getSolution()],
+                         record["solutions"])
+
+    async def test_identical_requests_share_one_solve(self):
+        mirrored = [row[::-1] for row in self.GRID]
+        answers = await asyncio.gather(
+            *[self.client.solve(self.GRID) for _ in range(5)],
+            self.client.solve(mirrored))
+        self.assertEqual(1, self.service.solves)
+        self.assertEqual(5, self.service.coalesced)
+        self.assertEqual(1, len(set(json.dumps(record["solutions"])
+                                    for _, record in answers)))
+
+    async def test_full_queue_is_refused(self):
+        grids = [[["A", "B"], ["C", letter]] for letter in "DEF"]
+        answers = await asyncio.gather(*[self.client.solve(grid)
+                                         for grid in grids])
+        self.assertEqual([200, 200, 503],
+                         [status for status, _ in answers])
+        _, stats = await self.client.stats()
+        self.assertEqual(1, stats["rejected"])
+        self.assertEqual(0, stats["pending"])
+        self.assertIsNotNone(stats["p99_seconds"])
+
+    async def test_bad_requests(self):
+        self.assertEqual(400, (await self.client.request(
+            "POST", "/solve", {"grid": "ABC"}))[0])
+        self.assertEqual(404, (await self.client.request("GET", "/"))[0])
+
+    async def test_http_round_trip(self):
+        server = await serve(self.service, port=0)
+        port = server.sockets[0].getsockname()[1]
+        async with server:
+            reader, writer = await asyncio.open_connection("127.0.0.1",
+                                                           port)
+            body = json.dumps({"grid": [["Qu", "A"], ["R", "T"]]}).encode()
+            writer.write(b"POST /solve HTTP/1.1\r\nContent-Length: %d"
+                         b"\r\n\r\n%s" % (len(body), body))
+            response = await reader.read()
+            writer.close()
+        head, _, payload = response.partition(b"\r\n\r\n")
+        self.assertTrue(head.startswith(b"HTTP/1.1 200 OK"))
+        self.assertIn("quart", json.loads(payload)["solutions"])
+
+    def test_percentile(self):
+        self.assertIsNone(percentile([], 0.5))
+        samples = list(range(1, 101))
+        self.assertEqual(50, percentile(samples, 0.50))
+        self.assertEqual(99, percentile(samples, 0.99))
+
+
 if __name__ == '__main__':
     unittest.main()